@@ -0,0 +1,402 @@
+# Description: Benchmarks the search engines on maze files, timing loading and search separately.
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from statistics import mean, median, stdev
+from search import ENGINE_CACHES, SEARCH_METHODS, createMemoryCache, loadEngine, loadMaze
+
+# Phases timed separately for every run. Loading reads the maze into a grid with loadMaze, as the
+# command line, batch and server modes do, so it covers parsing and building the grid together.
+PHASES = ('load_ms', 'search_ms', 'total_ms')
+
+# Phases whose slowdowns fail a comparison against a baseline
+GATED_PHASES = ('search_ms', 'total_ms')
+
+# Comparison outcomes that count as regressions
+REGRESSION_STATUSES = ('SLOWER', 'MORE NODES', 'MORE MEMORY', 'ERROR')
+
+
+class Benchmark:
+    def __init__(self, methods=None, repetitions=10, warmup=2, beam_width=2):
+        self.methods = list(methods or SEARCH_METHODS.keys())
+        self.repetitions = repetitions  # Timed runs per (maze, method)
+        self.warmup = warmup  # Untimed runs before them, to fill caches and settle the interpreter
+        self.beam_width = beam_width
+
+    # Create the search object for a method and run it
+    def runEngine(self, grid, method):
+        search_class, search_method = loadEngine(method)
+        if method == 'bs':
+            search = search_class(grid, beam_width=self.beam_width)
+        elif method in ENGINE_CACHES:
+            # Every run gets its own empty in-memory cache, so repetitions time a full solve and no cache files are written
+            search = search_class(grid, cache=createMemoryCache(method))
+        else:
+            search = search_class(grid)
+        found, path = getattr(search, search_method)()
+        return search, found, path
+
+    # Run one (maze, method) case from scratch, returning its phase timings in milliseconds and its outcome
+    def measureRun(self, filename, method):
+        gc.collect()
+        start_time = time.perf_counter()
+        grid = loadMaze(filename)
+        loaded_time = time.perf_counter()
+        search, found, path = self.runEngine(grid, method)
+        end_time = time.perf_counter()
+
+        timings = {
+            'load_ms': (loaded_time - start_time) * 1000,
+            'search_ms': (end_time - loaded_time) * 1000,
+            'total_ms': (end_time - start_time) * 1000
+        }
+        outcome = {
+            'found': found,
+            'nodes_explored': search.nodes_explored,
+            'path_length': len(path) if found else 0
+        }
+        return timings, outcome
+
+    # Measure the peak memory allocated by one run with tracemalloc, in KB: over the whole run,
+    # and by the search alone on top of the loaded grid.
+    # Tracing slows Python down, so this is a separate run that is not timed.
+    def measurePeakMemory(self, filename, method):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            grid = loadMaze(filename)
+            loaded, load_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            self.runEngine(grid, method)
+            search_peak = tracemalloc.get_traced_memory()[1]
+            return max(load_peak, search_peak) / 1024, (search_peak - loaded) / 1024
+        finally:
+            tracemalloc.stop()
+
+    # Summarize a list of samples
+    @staticmethod
+    def summarize(samples):
+        ordered = sorted(samples)
+        # Nearest-rank 95th percentile
+        p95 = ordered[max(math.ceil(0.95 * len(ordered)) - 1, 0)]
+        return {
+            'median': median(ordered),
+            'p95': p95,
+            'mean': mean(ordered),
+            'stddev': stdev(ordered) if len(ordered) > 1 else 0.0,
+            'min': ordered[0],
+            'max': ordered[-1]
+        }
+
+    # Benchmark one method on one maze file
+    def benchmarkCase(self, filename, method):
+        case = {'file': filename, 'method': method, 'error': None}
+        try:
+            for _ in range(self.warmup):
+                self.measureRun(filename, method)
+
+            samples = {phase: [] for phase in PHASES}
+            for _ in range(self.repetitions):
+                timings, outcome = self.measureRun(filename, method)
+                for phase in PHASES:
+                    samples[phase].append(timings[phase])
+
+            case.update(outcome)
+            for phase in PHASES:
+                case[phase] = self.summarize(samples[phase])
+            case['peak_kb'], case['search_peak_kb'] = self.measurePeakMemory(filename, method)
+        except Exception as e:
+            case['error'] = str(e)
+        return case
+
+    # Benchmark every method on every maze file, in that order
+    def run(self, filenames, progress=True):
+        results = []
+        for filename in filenames:
+            for method in self.methods:
+                if progress:
+                    print(f"Benchmarking {method} on {filename}...", file=sys.stderr)
+                results.append(self.benchmarkCase(filename, method))
+        return results
+
+    # Describe the settings and machine the results were measured with
+    def getSettings(self):
+        return {
+            'methods': self.methods,
+            'repetitions': self.repetitions,
+            'warmup': self.warmup,
+            'beam_width': self.beam_width,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system()
+        }
+
+    # Write results as JSON
+    def writeJson(self, results, filename):
+        with open(filename, 'w') as file:
+            json.dump({'settings': self.getSettings(), 'results': results}, file, indent=2)
+
+    # Print the results as a table
+    @staticmethod
+    def printReport(results):
+        from tabulate import tabulate
+        headers = ['Maze', 'Method', 'Load (ms)', 'Search median (ms)', 'Search p95 (ms)',
+                   'Search stddev (ms)', 'Peak (KB)', 'Nodes', 'Path Length']
+        rows = []
+        for case in results:
+            if case['error']:
+                rows.append([os.path.basename(case['file']), case['method'], f"Error: {case['error']}"])
+                continue
+            rows.append([
+                os.path.basename(case['file']),
+                case['method'],
+                f"{case['load_ms']['median']:.3f}",
+                f"{case['search_ms']['median']:.3f}",
+                f"{case['search_ms']['p95']:.3f}",
+                f"{case['search_ms']['stddev']:.3f}",
+                f"{case['peak_kb']:.1f}",
+                case['nodes_explored'],
+                case['path_length']
+            ])
+        print(tabulate(rows, headers=headers, tablefmt='grid'))
+
+
+# Compares benchmark runs against a baseline run saved as JSON
+class BaselineComparison:
+    def __init__(self, baseline, threshold=20.0, min_delta_ms=1.0, node_threshold=5.0, memory_threshold=20.0,
+                 min_delta_kb=64.0):
+        self.settings = baseline['settings']
+        self.cases = {self.caseKey(case): case for case in baseline['results']}
+        self.threshold = threshold  # Smallest change in a median that counts, in percent
+        self.min_delta_ms = min_delta_ms  # Smallest change in a median that counts, in milliseconds
+        self.node_threshold = node_threshold  # Smallest growth in nodes explored that counts, in percent
+        self.memory_threshold = memory_threshold  # Smallest growth in peak memory that counts, in percent
+        self.min_delta_kb = min_delta_kb  # Smallest growth in peak memory that counts, in KB
+
+    # Load a baseline written by Benchmark.writeJson
+    @staticmethod
+    def fromFile(filename, *thresholds):
+        with open(filename, 'r') as file:
+            return BaselineComparison(json.load(file), *thresholds)
+
+    # Key matching a case across runs
+    @staticmethod
+    def caseKey(case):
+        return os.path.normpath(case['file']), case['method']
+
+    # Percentage change from an old value to a new one
+    @staticmethod
+    def percentChange(old, new):
+        if not old:
+            return 0.0 if new == old else math.inf
+        return (new - old) / old * 100
+
+    # A phase slowed down if its median grew by more than the threshold and the minimum delta,
+    # and beyond the baseline's 95th percentile, so ordinary run-to-run noise is not reported
+    def isSlowdown(self, old, new):
+        delta = new['median'] - old['median']
+        return (delta > self.min_delta_ms and self.percentChange(old['median'], new['median']) > self.threshold and
+                new['median'] > old['p95'])
+
+    # A phase sped up if the same holds the other way around
+    def isSpeedup(self, old, new):
+        delta = old['median'] - new['median']
+        return (delta > self.min_delta_ms and -self.percentChange(old['median'], new['median']) > self.threshold and
+                new['p95'] < old['median'])
+
+    # Nodes explored grew by more than the node threshold; node counts do not depend on timing noise,
+    # so this catches an engine doing more work even when its wall time hides it
+    def hasMoreNodes(self, old, new):
+        return self.percentChange(old['nodes_explored'], new['nodes_explored']) > self.node_threshold
+
+    # Peak memory grew by more than the memory threshold and the minimum delta
+    def hasMoreMemory(self, old, new):
+        return (new['peak_kb'] - old['peak_kb'] > self.min_delta_kb and
+                self.percentChange(old['peak_kb'], new['peak_kb']) > self.memory_threshold)
+
+    # List the settings that differ from the baseline's, since they make timings less comparable
+    def getSettingDifferences(self, settings):
+        return [f"{key}: {self.settings.get(key)} -> {settings.get(key)}"
+                for key in ('repetitions', 'warmup', 'beam_width', 'python', 'implementation', 'machine', 'system')
+                if self.settings.get(key) != settings.get(key)]
+
+    # Compare a run's results with the baseline, returning one record per case
+    def compare(self, results):
+        records = []
+        seen = set()
+        for case in results:
+            key = self.caseKey(case)
+            seen.add(key)
+            old = self.cases.get(key)
+            record = {'file': case['file'], 'method': case['method'], 'status': 'OK', 'slower_phases': [],
+                      'regressions': []}
+
+            # A failure is only a regression if the baseline succeeded; one that already failed is unchanged
+            if case['error']:
+                record['error'] = case['error']
+                if old is None:
+                    record['status'] = 'NEW'
+                elif old['error']:
+                    record['status'] = 'STILL FAILING'
+                else:
+                    record['status'] = 'ERROR'
+            elif old is None:
+                record['status'] = 'NEW'
+            elif old['error']:
+                record['status'] = 'FIXED'
+            else:
+                # Baselines saved before a phase was added are compared on the phases they have
+                for phase in [phase for phase in PHASES if phase in old]:
+                    record[phase] = {
+                        'baseline': old[phase]['median'],
+                        'current': case[phase]['median'],
+                        'change_pct': self.percentChange(old[phase]['median'], case[phase]['median'])
+                    }
+                record['nodes_explored'] = {'baseline': old['nodes_explored'], 'current': case['nodes_explored']}
+                record['peak_kb'] = {
+                    'baseline': old['peak_kb'],
+                    'current': case['peak_kb'],
+                    'change_pct': self.percentChange(old['peak_kb'], case['peak_kb'])
+                }
+
+                record['slower_phases'] = [phase for phase in GATED_PHASES if self.isSlowdown(old[phase], case[phase])]
+                record['regressions'] = list(record['slower_phases'])
+                if self.hasMoreNodes(old, case):
+                    record['regressions'].append('nodes_explored')
+                if self.hasMoreMemory(old, case):
+                    record['regressions'].append('peak_kb')
+                if record['slower_phases']:
+                    record['status'] = 'SLOWER'
+                elif 'nodes_explored' in record['regressions']:
+                    record['status'] = 'MORE NODES'
+                elif 'peak_kb' in record['regressions']:
+                    record['status'] = 'MORE MEMORY'
+                elif any(self.isSpeedup(old[phase], case[phase]) for phase in GATED_PHASES):
+                    record['status'] = 'FASTER'
+            records.append(record)
+
+        # Cases in the baseline that this run did not cover
+        for key, old in self.cases.items():
+            if key not in seen:
+                records.append({'file': old['file'], 'method': old['method'], 'status': 'MISSING', 'slower_phases': [],
+                                'regressions': []})
+        return records
+
+    # Count the records that are regressions
+    @staticmethod
+    def countRegressions(records):
+        return sum(1 for record in records if record['status'] in REGRESSION_STATUSES)
+
+    # Print the comparison as a table
+    @staticmethod
+    def printReport(records):
+        from tabulate import tabulate
+        headers = ['Maze', 'Method', 'Search (ms)', 'Search Change', 'Total (ms)', 'Total Change',
+                   'Nodes', 'Peak Change', 'Status']
+        rows = []
+        for record in records:
+            row = [os.path.basename(record['file']), record['method']]
+            if 'search_ms' in record:
+                search, total = record['search_ms'], record['total_ms']
+                nodes = record['nodes_explored']
+                row += [
+                    f"{search['baseline']:.3f} -> {search['current']:.3f}",
+                    f"{search['change_pct']:+.1f}%",
+                    f"{total['baseline']:.3f} -> {total['current']:.3f}",
+                    f"{total['change_pct']:+.1f}%",
+                    str(nodes['current']) if nodes['baseline'] == nodes['current'] else f"{nodes['baseline']} -> {nodes['current']}",
+                    f"{record['peak_kb']['change_pct']:+.1f}%"
+                ]
+            else:
+                row += [''] * 6
+            status = record['status']
+            if len(record['regressions']) > 1:
+                status += f" ({', '.join(record['regressions'])})"
+            if record.get('error'):
+                status += f": {record['error']}"
+            row.append(status)
+            rows.append(row)
+        print(tabulate(rows, headers=headers, tablefmt='grid'))
+
+
+# Expand directories into the maze files they contain
+def collectMazeFiles(paths):
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                    if os.path.isfile(os.path.join(path, name))))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search engines on maze files.")
+    parser.add_argument('mazes', nargs='+', help="maze files, or directories of maze files")
+    parser.add_argument('-m', '--methods', help="comma-separated methods to run (default: all)")
+    parser.add_argument('-n', '--repetitions', type=int, default=10, help="timed runs per case (default: 10)")
+    parser.add_argument('-w', '--warmup', type=int, default=2, help="untimed runs before timing (default: 2)")
+    parser.add_argument('-b', '--beam-width', type=int, default=2, help="beam width for bs (default: 2)")
+    parser.add_argument('-o', '--output', help="write the results to this JSON file, e.g. to save a baseline")
+    parser.add_argument('--baseline', help="compare the results with a baseline saved with -o, "
+                        "exiting with status 1 on significant regressions")
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help="smallest slowdown of a median that counts, in percent (default: 20)")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help="smallest slowdown of a median that counts, in milliseconds (default: 1)")
+    parser.add_argument('--node-threshold', type=float, default=5.0,
+                        help="smallest growth in nodes explored that counts, in percent (default: 5)")
+    parser.add_argument('--memory-threshold', type=float, default=20.0,
+                        help="smallest growth in peak memory that counts, in percent (default: 20)")
+    parser.add_argument('--min-delta-kb', type=float, default=64.0,
+                        help="smallest growth in peak memory that counts, in KB (default: 64)")
+    args = parser.parse_args()
+
+    methods = args.methods.lower().split(',') if args.methods else None
+    for method in methods or []:
+        if method not in SEARCH_METHODS:
+            parser.error(f"Unknown search method '{method}'. Available methods: {', '.join(SEARCH_METHODS)}")
+    if args.repetitions < 1 or args.warmup < 0 or args.beam_width < 1:
+        parser.error("Repetitions and beam width must be positive, and warmup cannot be negative")
+
+    if min(args.threshold, args.min_delta_ms, args.node_threshold, args.memory_threshold, args.min_delta_kb) < 0:
+        parser.error("Thresholds and minimum deltas cannot be negative")
+
+    comparison = None
+    if args.baseline:
+        try:
+            comparison = BaselineComparison.fromFile(args.baseline, args.threshold, args.min_delta_ms, args.node_threshold,
+                                                     args.memory_threshold, args.min_delta_kb)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Could not read baseline {args.baseline}: {str(e)}")
+
+    benchmark = Benchmark(methods, args.repetitions, args.warmup, args.beam_width)
+    results = benchmark.run(collectMazeFiles(args.mazes))
+    benchmark.printReport(results)
+    if args.output:
+        benchmark.writeJson(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+    if comparison:
+        print(f"\nComparison with baseline {args.baseline}:")
+        for difference in comparison.getSettingDifferences(benchmark.getSettings()):
+            print(f"Warning: settings differ from the baseline ({difference})")
+        records = comparison.compare(results)
+        comparison.printReport(records)
+        regressions = comparison.countRegressions(records)
+        if regressions:
+            print(f"\n{regressions} significant regression(s) against the baseline")
+            sys.exit(1)
+        print("\nNo significant regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
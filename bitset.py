@@ -0,0 +1,31 @@
+# Description: Compact set of flat cell indices, stored as one bit per cell.
+
+class BitSet:
+    # Initialize an empty set able to hold indices 0 to size - 1
+    def __init__(self, size):
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+        self.count = 0
+
+    # Check if an index is in the set
+    def __contains__(self, index):
+        return self.bits[index >> 3] >> (index & 7) & 1 == 1
+
+    # Add an index to the set
+    def add(self, index):
+        byte, bit = index >> 3, 1 << (index & 7)
+        if not self.bits[byte] & bit:
+            self.bits[byte] |= bit
+            self.count += 1
+
+    # Number of indices in the set
+    def __len__(self):
+        return self.count
+
+    # Iterate over the indices in ascending order
+    def __iter__(self):
+        for byte, value in enumerate(self.bits):
+            if value:
+                for bit in range(8):
+                    if value >> bit & 1:
+                        yield (byte << 3) | bit
\ No newline at end of file
@@ -0,0 +1,106 @@
+# Description: Distance fields from the goals, cached by maze content, for answering queries without a search.
+from array import array
+from collections import deque
+from mazecache import CACHE_DIR, MazeCache
+from searchstrat import Search
+
+# Distance fields kept in memory at once; each takes four bytes per cell
+MAX_FIELDS = 4
+
+
+# Cache of goal distance fields, kept in memory and on disk
+class DistanceFieldCache(MazeCache):
+    extension = '.field'
+
+    # A cache_dir of None keeps fields in memory only
+    def __init__(self, cache_dir=CACHE_DIR, max_fields=MAX_FIELDS):
+        super().__init__(cache_dir, max_fields)
+
+    # Identify the state of a loaded grid without reading its cells: the grid object, the walls changed
+    # through setWall since it was loaded, and the goals and reopened endpoints the field depends on
+    @staticmethod
+    def gridKey(grid):
+        return id(grid), len(grid.changes), tuple(sorted(set(grid.goals))), tuple(grid.cleared_walls)
+
+    # Get the distance field for a grid, computing it only if no cached copy matches its content.
+    # Fields in memory are found by grid state; the content hash is only taken to check the disk cache.
+    def getField(self, grid):
+        grid_key = self.gridKey(grid)
+        field = self.getEntry(grid_key, grid)
+        if field is None:
+            # The field depends on the size, walls and goals of the maze (not the start)
+            header = f"{grid.rows},{grid.cols};{sorted(set(grid.goals))};"
+            field = self.loadOrBuild(grid, header, lambda: self.createField(grid))
+            self.putEntry(grid_key, grid, field)
+        return field
+
+    # Fields are stored as their four-byte distances, row by row
+    def readValue(self, file, grid):
+        field = array('i')
+        field.fromfile(file, grid.rows * grid.cols)
+        return field
+
+    # Write a field's distances
+    def writeValue(self, file, field):
+        field.tofile(file)
+
+    # Run a breadth-first search backwards from every goal at once.
+    # Each cell gets its distance in moves to the nearest goal, or -1 if no goal is reachable.
+    @staticmethod
+    def createField(grid):
+        rows, cols, cells = grid.rows, grid.cols, grid.cells
+        field = array('i', [-1]) * (rows * cols)
+        queue = deque()
+        for gx, gy in grid.goals:
+            goal = gy * cols + gx
+            if field[goal] < 0:
+                field[goal] = 0
+                queue.append(goal)
+
+        size = rows * cols
+        while queue:
+            current = queue.popleft()
+            distance = field[current] + 1
+            x = current % cols
+            # Up, left, down, right; a step off the left or right edge becomes -1
+            for next_index in (current - cols, current - 1 if x > 0 else -1,
+                               current + cols, current + 1 if x < cols - 1 else -1):
+                if 0 <= next_index < size and not cells[next_index] and field[next_index] < 0:
+                    field[next_index] = distance
+                    queue.append(next_index)
+        return field
+
+
+# Shared by every distance field search in this process
+FIELD_CACHE = DistanceFieldCache()
+
+
+# Answer a query by walking down the cached distance field from the start
+class DistanceFieldSearch(Search):
+    def __init__(self, grid, cache=None):
+        super().__init__(grid)
+        self.cache = cache if cache is not None else FIELD_CACHE
+
+    def fieldPath(self):
+        field = self.cache.getField(self.grid)
+        current = self.start_id
+        self.visited_ids.append(current)
+        self.nodes_explored = 1
+        self.markVisited(current)
+        if field[current] < 0:
+            # No path found
+            return False, []
+
+        # Step to a neighbor one move closer to a goal, preferring directions in priority order
+        while field[current] > 0:
+            for next_index in self.getNeighbors(current):
+                if field[next_index] == field[current] - 1:
+                    current = next_index
+                    break
+            self.visited_ids.append(current)
+            self.nodes_explored += 1
+            self.markVisited(current)
+
+        path = [self.grid.position(index) for index in self.visited_ids]
+        self.markFinalPath(path)
+        return True, path
\ No newline at end of file
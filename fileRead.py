@@ -1,4 +1,17 @@
 # Description: Reads and parses maze configurations from text files.
+import mmap
+import struct
+from itertools import islice
+from grid import Grid
+
+# Binary maze format, all integers little-endian:
+#   magic b'MAZEBIN1', rows and cols (uint32), start x and y (int32), goal count (uint32),
+#   an x and y pair (int32) per goal, then one occupancy byte per cell in row-major order.
+# Cells use the grid's own layout so they can be mapped without copying. Walls under the
+# start and goals are kept; the grid opens them on load as it does for a text maze.
+BINARY_MAGIC = b'MAZEBIN1'
+BINARY_HEADER = struct.Struct('<8sIIiiI')
+BINARY_POSITION = struct.Struct('<ii')
 
 class FileRead:
     # Read the maze configuration file
@@ -17,6 +30,23 @@ class FileRead:
             raise ValueError(f"{pos_type} position {pos} is out of bounds. "f"Grid size is {cols}x{rows}")
 
 
+    # Parse a position written as (x,y) or [x,y]
+    @staticmethod
+    def parsePosition(text):
+        return tuple(map(int, text.strip()[1:-1].split(',')))
+
+
+    # Parse and validate goal positions separated by '|'
+    @staticmethod
+    def parseGoals(text, rows, cols):
+        goals = []
+        for goal in text.split('|'):
+            goal_pos = FileRead.parsePosition(goal)
+            FileRead.validatePosition(goal_pos, rows, cols, "Goal")
+            goals.append(goal_pos)
+        return goals
+
+
     # Check if wall placement is valid
     @staticmethod
     def validateWall(wall_info, rows, cols):
@@ -27,31 +57,39 @@ class FileRead:
             raise ValueError(f"Wall {wall_info} is out of bounds. "f"Grid size is {cols}x{rows}")
 
 
+    # Parse and validate one wall line
+    @staticmethod
+    def parseWall(line, rows, cols):
+        wall_info = tuple(map(int, line[1:-1].split(',')))
+        FileRead.validateWall(wall_info, rows, cols)
+        return wall_info
+
+
+    # Parse the dimensions, start and goals from the first three configuration lines
+    @staticmethod
+    def parseHeader(lines):
+        # Get grid dimensions
+        dimensions = tuple(map(int, lines[0][1:-1].split(',')))
+        rows, cols = dimensions
+
+        # Get and validate start position
+        start = FileRead.parsePosition(lines[1])
+        FileRead.validatePosition(start, rows, cols, "Start")
+
+        # Get and validate goal positions
+        goals = FileRead.parseGoals(lines[2], rows, cols)
+        return dimensions, start, goals
+
+
     # Parse grid information from configuration lines
     @staticmethod
     def parseGridInfo(lines):
         try:
-            # Get grid dimensions
-            dimensions = tuple(map(int, lines[0][1:-1].split(',')))
+            dimensions, start, goals = FileRead.parseHeader(lines)
             rows, cols = dimensions
             
-            # Get and validate start position
-            start = tuple(map(int, lines[1][1:-1].split(',')))
-            FileRead.validatePosition(start, rows, cols, "Start")
-            
-            # Get and validate goal positions
-            goals = []
-            for goal in lines[2].split('|'):
-                goal_pos = tuple(map(int, goal.strip()[1:-1].split(',')))
-                FileRead.validatePosition(goal_pos, rows, cols, "Goal")
-                goals.append(goal_pos)
-            
             # Get and validate wall positions
-            walls = []
-            for line in lines[3:]:
-                wall_info = tuple(map(int, line[1:-1].split(',')))
-                FileRead.validateWall(wall_info, rows, cols)
-                walls.append(wall_info)
+            walls = [FileRead.parseWall(line, rows, cols) for line in lines[3:]]
             
             return {
                 'dimensions': dimensions,
@@ -64,3 +102,93 @@ class FileRead:
             raise ValueError("Incomplete maze configuration file")
         except ValueError as e:
             raise ValueError(f"Invalid maze configuration: {str(e)}")
+
+
+    # Load a maze file straight into a grid, one line at a time.
+    # Each wall is validated and rasterized as it is read, so neither the file's lines nor
+    # its wall list are kept; memory is bounded by the grid. Errors match parseGridInfo.
+    @staticmethod
+    def loadGrid(filename):
+        with open(filename, 'r') as file:
+            try:
+                dimensions, start, goals = FileRead.parseHeader([line.strip() for line in islice(file, 3)])
+                rows, cols = dimensions
+                grid = Grid(dimensions, start, goals, [])
+                grid.addWalls(FileRead.parseWall(line.strip(), rows, cols) for line in file)
+                return grid
+
+            except IndexError:
+                raise ValueError("Incomplete maze configuration file")
+            except ValueError as e:
+                raise ValueError(f"Invalid maze configuration: {str(e)}")
+
+
+    # Check whether a file is in the binary maze format
+    @staticmethod
+    def isBinaryMaze(filename):
+        with open(filename, 'rb') as file:
+            return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+    # Write the header of a binary maze, which the cells follow one byte each, row by row
+    @staticmethod
+    def writeBinaryHeader(file, rows, cols, start, goals):
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, rows, cols, *start, len(goals)))
+        for goal in goals:
+            file.write(BINARY_POSITION.pack(*goal))
+
+
+    # Write a grid in the binary maze format
+    @staticmethod
+    def writeBinary(grid, filename):
+        with open(filename, 'wb') as file:
+            FileRead.writeBinaryHeader(file, grid.rows, grid.cols, grid.start, grid.goals)
+            offset = file.tell()
+            file.write(grid.cells)
+
+            # Put back the walls the grid opened under its start and goals
+            for index in grid.cleared_walls:
+                file.seek(offset + index)
+                file.write(b'\x01')
+
+
+    # Convert a text maze file to the binary format
+    @staticmethod
+    def convertToBinary(text_filename, binary_filename):
+        FileRead.writeBinary(FileRead.loadGrid(text_filename), binary_filename)
+
+
+    # Open a binary maze file without reading it into memory.
+    # The grid's occupancy buffer is a copy-on-write map of the file, so processes opening the
+    # same maze share one page-cached copy, and only pages the grid writes to are copied.
+    @staticmethod
+    def loadBinaryGrid(filename):
+        with open(filename, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        # A rejected file's map is closed here, as no grid will hold it open
+        try:
+            magic, rows, cols, start_x, start_y, goal_count = BINARY_HEADER.unpack_from(data)
+            if magic != BINARY_MAGIC:
+                raise ValueError("Not a binary maze file")
+            offset = BINARY_HEADER.size
+            goals = []
+            for _ in range(goal_count):
+                goals.append(BINARY_POSITION.unpack_from(data, offset))
+                offset += BINARY_POSITION.size
+            if len(data) != offset + rows * cols:
+                raise ValueError(f"Cell data does not match the grid size {cols}x{rows}")
+
+            start = (start_x, start_y)
+            FileRead.validatePosition(start, rows, cols, "Start")
+            for goal in goals:
+                FileRead.validatePosition(goal, rows, cols, "Goal")
+
+        except struct.error:
+            data.close()
+            raise ValueError("Incomplete maze configuration file")
+        except ValueError as e:
+            data.close()
+            raise ValueError(f"Invalid maze configuration: {str(e)}")
+
+        return Grid((rows, cols), start, goals, [], cells=memoryview(data)[offset:])
@@ -1,43 +1,232 @@
 # Description: Creates a grid with the specified dimensions, start position, goals, and walls.
+from array import array
+from bisect import bisect_left
+
+# Symbols drawn for each mark code; code 0 means the cell shows its occupancy ('•' or '#')
+MARK_SYMBOLS = ' SGVPX'
 
 class Grid:
     # Initialize the grid
-    def __init__(self, dimensions, start, goals, walls):
+    def __init__(self, dimensions, start, goals, walls, cells=None):
         self.rows, self.cols = dimensions
         self.start = start
         self.goals = goals
         self.walls = walls
-        self.grid = self.createGrid()
+        self.source = None  # Maze file the grid was loaded from, if any
+        # Occupancy buffer: one byte per cell in row-major order, non-zero for walls.
+        # A ready-made buffer (such as a mapped binary maze) can be given instead of walls.
+        self.cells = self.createGrid(cells)
+        # Marks drawn over the occupancy when displayed (start, goals and search progress)
+        self.marks = self.createMarks()
+        # Nearest-goal distance field, built on first use and kept with the goals it was built for
+        self.goal_field = None
+        # Cells whose occupancy was changed by setWall, in order, so searches can catch up with them
+        self.changes = array('i')
 
     # Check if position is within grid bounds
     def isValidPosition(self, x, y):
         return 0 <= y < self.rows and 0 <= x < self.cols
 
-    # Create the grid
-    def createGrid(self):
-        # Initialize empty grid
-        grid = [['•' for _ in range(self.cols)] for _ in range(self.rows)]
+    # Convert a position to its flat cell index
+    def index(self, x, y):
+        return y * self.cols + x
+
+    # Convert a flat cell index back to a position
+    def position(self, index):
+        y, x = divmod(index, self.cols)
+        return x, y
+
+    # Create the occupancy buffer
+    def createGrid(self, cells=None):
+        # Initialize empty grid, unless an occupancy buffer was given
+        if cells is None:
+            cells = bytearray(self.rows * self.cols)
 
         # Place walls
-        for wx, wy, w, h in self.walls:
-            for i in range(h):
-                for j in range(w):
-                    if self.isValidPosition(wx + j, wy + i):
-                        grid[wy + i][wx + j] = '#'
+        for wall in self.walls:
+            self.fillWall(cells, wall)
+
+        self.cleared_walls = self.openEndpoints(cells)
+        return cells
+
+    # Mark the cells covered by a wall rectangle, clipped to the grid.
+    # Fills whole rows, or whole columns for tall walls, as slices,
+    # so a wall costs min(width, height) slice assignments rather than one step per cell.
+    def fillWall(self, cells, wall):
+        wx, wy, w, h = wall
+        cols = self.cols
+        left, right = max(wx, 0), min(wx + w, cols)
+        top, bottom = max(wy, 0), min(wy + h, self.rows)
+        if left >= right or top >= bottom:
+            return
+
+        width, height = right - left, bottom - top
+        if width == cols:
+            # Full-width block: one contiguous run
+            cells[top * cols:bottom * cols] = b'\x01' * (width * height)
+        elif width >= height:
+            row = b'\x01' * width
+            for y in range(top * cols, bottom * cols, cols):
+                cells[y + left:y + right] = row
+        else:
+            column = b'\x01' * height
+            for x in range(left, right):
+                cells[top * cols + x:bottom * cols + x:cols] = column
+
+    # Rasterize further walls into the occupancy buffer as they arrive, without keeping them.
+    # The start and goals are reopened afterwards, as in createGrid.
+    def addWalls(self, walls):
+        for wall in walls:
+            self.fillWall(self.cells, wall)
+        self.cleared_walls += self.openEndpoints(self.cells)
+
+    # Turn a cell into a wall or open it again, as when a door closes or a shelf moves.
+    # Returns whether the cell changed; changes are recorded in the change log.
+    def setWall(self, x, y, wall=True):
+        self.checkWallPosition(x, y)
+        index = y * self.cols + x
+        if bool(self.cells[index]) == wall:
+            return False
+        self.cells[index] = 1 if wall else 0
+        self.changes.append(index)
+        return True
+
+    # Raise ValueError if setWall cannot change a cell: outside the grid, or the start or a goal
+    def checkWallPosition(self, x, y):
+        if not self.isValidPosition(x, y):
+            raise ValueError(f"Wall position ({x},{y}) is out of bounds")
+        if (x, y) == self.start or (x, y) in self.goals:
+            raise ValueError(f"Cannot place a wall on the start or a goal at ({x},{y})")
+
+    # Open a wall cell or close an open one
+    def toggleWall(self, x, y):
+        # Out of bounds positions are rejected by setWall
+        wall = self.isValidPosition(x, y) and not self.cells[self.index(x, y)]
+        return self.setWall(x, y, wall)
+
+    # Start and goals are always passable, even when a wall covers them.
+    # Returns the wall cells that were opened, so they can be restored.
+    def openEndpoints(self, cells):
+        cleared = []
+        for x, y in [self.start] + list(self.goals):
+            if self.isValidPosition(x, y) and cells[y * self.cols + x]:
+                cells[y * self.cols + x] = 0
+                cleared.append(y * self.cols + x)
+        return cleared
+
+    # Move the start and goals, leaving the grid as if it had been loaded with them
+    def setEndpoints(self, start, goals):
+        for index in self.cleared_walls:
+            self.cells[index] = 1
+        self.start, self.goals = start, goals
+        self.cleared_walls = self.openEndpoints(self.cells)
+        self.reset()
+
+    # Clear the marks left by a previous search
+    def reset(self):
+        self.marks = self.createMarks()
+
+    # Create the mark buffer with the start and goal positions
+    def createMarks(self):
+        marks = bytearray(self.rows * self.cols)
 
         # Place start position
         sx, sy = self.start
         if self.isValidPosition(sx, sy):
-            grid[sy][sx] = 'S'
+            marks[sy * self.cols + sx] = MARK_SYMBOLS.index('S')
 
         # Place goals
         for gx, gy in self.goals:
             if self.isValidPosition(gx, gy):
-                grid[gy][gx] = 'G'
-        
-        return grid
+                marks[gy * self.cols + gx] = MARK_SYMBOLS.index('G')
+
+        return marks
+
+    # Get the Manhattan distance from every cell to its nearest goal, ignoring walls.
+    # The field is filled lazily, so a short search only pays for the rows it reads.
+    def getGoalDistanceField(self):
+        goals = tuple(self.goals)
+        if self.goal_field is None or self.goal_field[0] != goals:
+            self.goal_field = (goals, GoalDistanceField(self.rows, self.cols, goals))
+        return self.goal_field[1]
+
+    # Get the character shown for a position
+    def getSymbol(self, x, y):
+        return self.getSymbolAt(y * self.cols + x)
+
+    # Get the character shown for a flat cell index
+    def getSymbolAt(self, index):
+        if self.marks[index]:
+            return MARK_SYMBOLS[self.marks[index]]
+        return '#' if self.cells[index] else '•'
+
+    # Draw a mark ('S', 'G', 'V', 'P' or 'X') on a position
+    def setSymbol(self, x, y, symbol):
+        self.setSymbolAt(y * self.cols + x, symbol)
+
+    # Draw a mark on a flat cell index
+    def setSymbolAt(self, index, symbol):
+        self.marks[index] = MARK_SYMBOLS.index(symbol)
+
+    # Build one row of the character matrix
+    def getRow(self, y):
+        return [self.getSymbol(x, y) for x in range(self.cols)]
+
+    # Character matrix, built on demand for display and visualization
+    @property
+    def grid(self):
+        return [self.getRow(y) for y in range(self.rows)]
 
     # Display the grid
     def display(self):
-        for row in self.grid:
-            print(' '.join(row))
\ No newline at end of file
+        for y in range(self.rows):
+            print(' '.join(self.getRow(y)))
+
+
+# Nearest-goal Manhattan distances in a flat array, filled one row at a time when a row is first read
+class GoalDistanceField:
+    def __init__(self, rows, cols, goals):
+        self.rows, self.cols = rows, cols
+
+        # Rows of the goals in each column that holds goals
+        goal_columns = {}
+        for gx, gy in goals:
+            goal_columns.setdefault(gx, []).append(gy)
+        self.goal_xs = sorted(goal_columns)
+        self.goal_ys = [sorted(goal_columns[gx]) for gx in self.goal_xs]
+
+        # -1 marks cells whose row has not been filled yet
+        self.distances = array('i', [-1]) * (rows * cols)
+
+    # Distance from a flat cell index to its nearest goal
+    def __getitem__(self, index):
+        distance = self.distances[index]
+        if distance < 0:
+            self.fillRow(index // self.cols)
+            distance = self.distances[index]
+        return distance
+
+    # Fill a row in O(goal columns + cols): first the distance down each goal column,
+    # then along the row, where each cell only depends on the goal columns on either side of it
+    def fillRow(self, y):
+        xs = self.goal_xs
+        ends = []
+        for ys in self.goal_ys:
+            i = bisect_left(ys, y)
+            distance = ys[i] - y if i < len(ys) else self.rows
+            ends.append(min(distance, y - ys[i - 1]) if i else distance)
+        # Exact at the goal columns after a sweep each way across them
+        for j in range(1, len(xs)):
+            ends[j] = min(ends[j], ends[j - 1] + xs[j] - xs[j - 1])
+        for j in range(len(xs) - 2, -1, -1):
+            ends[j] = min(ends[j], ends[j + 1] + xs[j + 1] - xs[j])
+
+        # Between two goal columns the distance rises from the left one, then falls to the right one
+        row = array('i', range(ends[0] + xs[0], ends[0], -1))
+        for j in range(len(xs) - 1):
+            left, right = xs[j], xs[j + 1]
+            turn = min((ends[j + 1] - ends[j] + left + right) // 2, right - 1)
+            row.extend(range(ends[j], ends[j] + turn - left + 1))
+            row.extend(range(ends[j + 1] + right - turn - 1, ends[j + 1], -1))
+        row.extend(range(ends[-1], ends[-1] + self.cols - xs[-1]))
+        self.distances[y * self.cols:(y + 1) * self.cols] = row
\ No newline at end of file
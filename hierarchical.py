@@ -0,0 +1,561 @@
+# Description: Hierarchical pathfinding (HPA*) on a graph of cluster entrances, cached by maze content and
+# updated cluster by cluster when walls change.
+import argparse
+import heapq
+import random
+import sys
+import time
+from array import array
+from collections import deque
+from mazecache import CACHE_DIR, MazeCache
+from searchstrat import Search
+
+# Side of the square clusters the grid is split into
+CLUSTER_SIZE = 32
+
+# Entrances at least this long get a transition at each end instead of one in the middle
+LONG_ENTRANCE = 6
+
+# Cluster graphs kept in memory at once
+MAX_GRAPHS = 4
+
+
+# Abstract graph of a grid: entrance cells on cluster borders, joined by their distances inside each cluster
+# and by single steps across borders. Edges are stored compactly: those of node n are at offsets[n] to offsets[n + 1].
+# The same graph is also kept per border and per cluster, so that changed walls only rebuild the clusters they touch.
+class ClusterGraph:
+    def __init__(self, rows, cols, cluster_size, node_cells, offsets, targets, costs):
+        self.rows, self.cols = rows, cols
+        self.cluster_size = cluster_size
+        self.clusters_across = (cols + cluster_size - 1) // cluster_size
+        self.clusters_down = (rows + cluster_size - 1) // cluster_size
+        self.node_cells = node_cells  # Cell index of each node
+        self.offsets = offsets
+        self.targets = targets  # Node at the end of each edge
+        self.costs = costs  # Moves along each edge
+        self.node_ids = {cell: node for node, cell in enumerate(node_cells)}
+        self.cluster_nodes = {}  # Cluster -> its nodes
+        for node, cell in enumerate(node_cells):
+            self.cluster_nodes.setdefault(self.getCluster(cell), []).append(node)
+        self.transitions = None  # Border -> its (inside, outside) cell pairs, found from the edges when first needed
+        self.cluster_edges = None  # Cluster -> {(cell, cell): distance} between its nodes
+        self.changed_edges = {}  # Node -> its edges, replacing the compact ones after walls changed
+
+    # Cluster holding a cell
+    def getCluster(self, index):
+        y, x = divmod(index, self.cols)
+        return (y // self.cluster_size) * self.clusters_across + x // self.cluster_size
+
+    # Bounds of a cluster as (left, top, right, bottom), right and bottom exclusive
+    def getBounds(self, cluster):
+        cy, cx = divmod(cluster, self.clusters_across)
+        left, top = cx * self.cluster_size, cy * self.cluster_size
+        return left, top, min(left + self.cluster_size, self.cols), min(top + self.cluster_size, self.rows)
+
+    # Breadth-first search from a cell without leaving its cluster, stopping early once a target cell is reached.
+    # Returns the distance and predecessor of each cell of the cluster by local index (row by row from the
+    # cluster's top-left cell; -1 if unreached), and the number of cells expanded.
+    def searchCluster(self, cells, source, bounds, target=None):
+        left, top, right, bottom = bounds
+        width, height = right - left, bottom - top
+        cols = self.cols
+        distances = array('i', [-1]) * (width * height)
+        parents = array('i', [-1]) * (width * height)
+        y, x = divmod(source, cols)
+        first = (y - top) * width + x - left
+        distances[first] = 0
+        parents[first] = first
+        queue = deque([first])
+        expanded = 0
+        target = -1 if target is None else self.getLocalIndex(target, cols, bounds)
+
+        while queue:
+            current = queue.popleft()
+            expanded += 1
+            distance = distances[current] + 1
+            local_y, local_x = divmod(current, width)
+            cell = (top + local_y) * cols + left + local_x
+            # Up, left, down, right, staying inside the cluster
+            for next_local, next_cell in ((current - width if local_y > 0 else -1, cell - cols),
+                                          (current - 1 if local_x > 0 else -1, cell - 1),
+                                          (current + width if local_y < height - 1 else -1, cell + cols),
+                                          (current + 1 if local_x < width - 1 else -1, cell + 1)):
+                if next_local >= 0 and distances[next_local] < 0 and not cells[next_cell]:
+                    distances[next_local] = distance
+                    parents[next_local] = current
+                    queue.append(next_local)
+                    if next_local == target:
+                        return distances, parents, expanded
+        return distances, parents, expanded
+
+    # Local index of a cell in the cluster with the given bounds
+    @staticmethod
+    def getLocalIndex(index, cols, bounds):
+        y, x = divmod(index, cols)
+        return (y - bounds[1]) * (bounds[2] - bounds[0]) + x - bounds[0]
+
+    # Edges of a node, plus any added for the current query
+    def getEdges(self, node, extra_edges):
+        if node in self.changed_edges:
+            yield from self.changed_edges[node]
+        elif node < len(self.offsets) - 1:
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                yield self.targets[edge], self.costs[edge]
+        yield from extra_edges.get(node, ())
+
+    # Borders between neighboring clusters, as (left or top cluster, right or bottom cluster),
+    # vertical borders first, in the order their transitions are numbered
+    def getBorders(self):
+        across, down = self.clusters_across, self.clusters_down
+        borders = [(cy * across + cx - 1, cy * across + cx) for cx in range(1, across) for cy in range(down)]
+        borders += [((cy - 1) * across + cx, cy * across + cx) for cy in range(1, down) for cx in range(across)]
+        return borders
+
+    # Borders of a cluster with its neighbors
+    def getClusterBorders(self, cluster):
+        cy, cx = divmod(cluster, self.clusters_across)
+        borders = []
+        if cx > 0:
+            borders.append((cluster - 1, cluster))
+        if cx < self.clusters_across - 1:
+            borders.append((cluster, cluster + 1))
+        if cy > 0:
+            borders.append((cluster - self.clusters_across, cluster))
+        if cy < self.clusters_down - 1:
+            borders.append((cluster, cluster + self.clusters_across))
+        return borders
+
+    # Place transitions on a border: it is a line of cell pairs, one on each side, and every open stretch
+    # of pairs is an entrance, crossed in its middle or, if long, at both ends
+    def findTransitions(self, cells, border):
+        first, second = border
+        left, top, right, bottom = self.getBounds(second)
+        cols = self.cols
+        if second == first + self.clusters_across:
+            pairs = [((top - 1) * cols + x, top * cols + x) for x in range(left, right)]
+        else:
+            pairs = [(y * cols + left - 1, y * cols + left) for y in range(top, bottom)]
+
+        transitions = []
+        run = []
+        for inside, outside in pairs + [(None, None)]:
+            if inside is not None and not cells[inside] and not cells[outside]:
+                run.append((inside, outside))
+                continue
+            if len(run) >= LONG_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        return transitions
+
+    # Cells of a cluster that are nodes, from the transitions on its borders
+    def getClusterCells(self, cluster, transitions):
+        cluster_cells = set()
+        for border in self.getClusterBorders(cluster):
+            for pair in transitions[border]:
+                cluster_cells.update(cell for cell in pair if self.getCluster(cell) == cluster)
+        return cluster_cells
+
+    # Distances between the node cells of a cluster that can reach each other without leaving it
+    def findClusterEdges(self, cells, cluster, cluster_cells):
+        bounds = self.getBounds(cluster)
+        ordered = sorted(cluster_cells)
+        edges = {}
+        for i, cell in enumerate(ordered[:-1]):
+            distances = self.searchCluster(cells, cell, bounds)[0]
+            for other in ordered[i + 1:]:
+                distance = distances[self.getLocalIndex(other, self.cols, bounds)]
+                if distance > 0:
+                    edges[cell, other] = distance
+        return edges
+
+    # Recover the transitions and in-cluster distances from the edges, for a graph loaded from disk
+    def splitEdges(self):
+        transitions = {border: [] for border in self.getBorders()}
+        cluster_edges = {cluster: {} for cluster in range(self.clusters_across * self.clusters_down)}
+        node_cells = self.node_cells
+        for node, cell in enumerate(node_cells):
+            cluster = self.getCluster(cell)
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                other = node_cells[self.targets[edge]]
+                other_cluster = self.getCluster(other)
+                if other_cluster == cluster:
+                    if cell < other:
+                        cluster_edges[cluster][cell, other] = self.costs[edge]
+                elif cluster < other_cluster:
+                    transitions[cluster, other_cluster].append((cell, other))
+        for pairs in transitions.values():
+            pairs.sort()
+        self.transitions, self.cluster_edges = transitions, cluster_edges
+
+    # Number the nodes and lay out the edges of a graph given per border and per cluster.
+    # Nodes are numbered in border order and edges listed transitions first, as the graph was always built.
+    @classmethod
+    def assemble(cls, rows, cols, cluster_size, transitions, cluster_edges):
+        node_ids = {}
+        edges = []  # Per node, a list of (node, cost)
+
+        def addNode(cell):
+            if cell not in node_ids:
+                node_ids[cell] = len(node_ids)
+                edges.append([])
+            return node_ids[cell]
+
+        graph = cls(rows, cols, cluster_size, array('i'), array('i'), array('i'), array('i'))
+        for border in graph.getBorders():
+            for inside, outside in transitions[border]:
+                a, b = addNode(inside), addNode(outside)
+                edges[a].append((b, 1))
+                edges[b].append((a, 1))
+
+        graph = cls(rows, cols, cluster_size, array('i', sorted(node_ids, key=node_ids.get)),
+                    array('i'), array('i'), array('i'))
+        for cluster, nodes in graph.cluster_nodes.items():
+            distances = cluster_edges[cluster]
+            for i, node in enumerate(nodes[:-1]):
+                cell = graph.node_cells[node]
+                for other in nodes[i + 1:]:
+                    other_cell = graph.node_cells[other]
+                    distance = distances.get((min(cell, other_cell), max(cell, other_cell)))
+                    if distance:
+                        edges[node].append((other, distance))
+                        edges[other].append((node, distance))
+
+        graph.offsets.append(0)
+        for node_edges in edges:
+            for target, cost in node_edges:
+                graph.targets.append(target)
+                graph.costs.append(cost)
+            graph.offsets.append(len(graph.targets))
+        graph.transitions, graph.cluster_edges = transitions, cluster_edges
+        return graph
+
+    # Build the graph of a grid: place transitions on every cluster border,
+    # then join the transitions inside each cluster by their in-cluster distances
+    @classmethod
+    def build(cls, grid, cluster_size=CLUSTER_SIZE):
+        cells = grid.cells
+        layout = cls(grid.rows, grid.cols, cluster_size, array('i'), array('i'), array('i'), array('i'))
+        transitions = {border: layout.findTransitions(cells, border) for border in layout.getBorders()}
+        cluster_edges = {}
+        for cluster in range(layout.clusters_across * layout.clusters_down):
+            cluster_edges[cluster] = layout.findClusterEdges(cells, cluster, layout.getClusterCells(cluster, transitions))
+        return cls.assemble(grid.rows, grid.cols, cluster_size, transitions, cluster_edges)
+
+    # Edges of a node from the transitions and in-cluster distances of its cluster
+    def findNodeEdges(self, node):
+        cell = self.node_cells[node]
+        cluster = self.getCluster(cell)
+        edges = []
+        for border in self.getClusterBorders(cluster):
+            for inside, outside in self.transitions[border]:
+                if inside == cell:
+                    edges.append((self.node_ids[outside], 1))
+                elif outside == cell:
+                    edges.append((self.node_ids[inside], 1))
+        distances = self.cluster_edges[cluster]
+        for other in self.cluster_nodes[cluster]:
+            other_cell = self.node_cells[other]
+            distance = distances.get((min(cell, other_cell), max(cell, other_cell)))
+            if distance:
+                edges.append((other, distance))
+        return edges
+
+    # Bring the graph up to date after the given cells changed, in place: the borders of the clusters holding
+    # them are searched again, and the in-cluster distances are recomputed for those clusters and any whose
+    # entrances moved. Nodes that stay keep their numbers; nodes that go are left without edges, and the
+    # graph is laid out afresh once they outnumber the live ones. Returns the updated graph.
+    def update(self, grid, changed_cells):
+        if self.transitions is None:
+            self.splitEdges()
+        cells = grid.cells
+
+        dirty = {self.getCluster(cell) for cell in changed_cells}
+        for border in {border for cluster in dirty for border in self.getClusterBorders(cluster)}:
+            found = self.findTransitions(cells, border)
+            if found != self.transitions[border]:
+                self.transitions[border] = found
+                dirty.update(border)
+
+        for cluster in dirty:
+            cluster_cells = self.getClusterCells(cluster, self.transitions)
+            self.cluster_edges[cluster] = self.findClusterEdges(cells, cluster, cluster_cells)
+            nodes = []
+            for node in self.cluster_nodes.pop(cluster, []):
+                if self.node_cells[node] in cluster_cells:
+                    nodes.append(node)
+                    cluster_cells.discard(self.node_cells[node])
+                else:
+                    del self.node_ids[self.node_cells[node]]
+                    self.changed_edges[node] = []
+            for cell in sorted(cluster_cells):
+                self.node_ids[cell] = len(self.node_cells)
+                nodes.append(len(self.node_cells))
+                self.node_cells.append(cell)
+            if nodes:
+                self.cluster_nodes[cluster] = nodes
+
+        if len(self.node_cells) > 2 * len(self.node_ids) + 1024:
+            return self.assemble(self.rows, self.cols, self.cluster_size, self.transitions, self.cluster_edges)
+        for cluster in dirty:
+            for node in self.cluster_nodes.get(cluster, []):
+                self.changed_edges[node] = self.findNodeEdges(node)
+        return self
+
+
+# Cache of cluster graphs, kept in memory and on disk
+class ClusterGraphCache(MazeCache):
+    extension = '.hpa'
+
+    # A cache_dir of None keeps graphs in memory only
+    def __init__(self, cache_dir=CACHE_DIR, max_graphs=MAX_GRAPHS):
+        super().__init__(cache_dir, max_graphs)
+
+    # Get the cluster graph for a grid. A grid seen before is found without reading its cells, and walls changed
+    # since (through setWall, or reopened under moved endpoints) only rebuild the clusters around them.
+    # Otherwise the graph is loaded from disk if a cached copy matches the grid's content, or built.
+    # Entries are kept by (grid id, cluster size) as (changes applied, reopened endpoints, graph).
+    def getGraph(self, grid, cluster_size=CLUSTER_SIZE):
+        key = (id(grid), cluster_size)
+        entry = self.getEntry(key, grid)
+        if entry is not None:
+            change_count, cleared, graph = entry
+            if change_count != len(grid.changes) or cleared != grid.cleared_walls:
+                changed = set(grid.changes[change_count:]).union(set(cleared).symmetric_difference(grid.cleared_walls))
+                graph = graph.update(grid, changed)
+                self.putEntry(key, grid, (len(grid.changes), list(grid.cleared_walls), graph))
+            return graph
+
+        # The graph depends on the size and walls of the maze (not the start or goals)
+        header = f"{grid.rows},{grid.cols};{cluster_size};"
+        graph = self.loadOrBuild(grid, header, lambda: ClusterGraph.build(grid, cluster_size), cluster_size)
+        self.putEntry(key, grid, (len(grid.changes), list(grid.cleared_walls), graph))
+        return graph
+
+    # Graphs are stored as their node and edge counts, then their four compact arrays
+    def readValue(self, file, grid, cluster_size):
+        counts = array('i')
+        counts.fromfile(file, 2)
+        node_count, edge_count = counts
+        arrays = []
+        for length in (node_count, node_count + 1, edge_count, edge_count):
+            values = array('i')
+            values.fromfile(file, length)
+            arrays.append(values)
+        return ClusterGraph(grid.rows, grid.cols, cluster_size, *arrays)
+
+    # Write a graph's counts and compact arrays
+    def writeValue(self, file, graph):
+        array('i', [len(graph.node_cells), len(graph.targets)]).tofile(file)
+        for values in (graph.node_cells, graph.offsets, graph.targets, graph.costs):
+            values.tofile(file)
+
+
+# Shared by every hierarchical search in this process
+GRAPH_CACHE = ClusterGraphCache()
+
+
+# Answer a query with A* on the cluster graph, then fill in the moves inside each cluster on the way.
+# Paths are near-optimal: within a cluster they run through the chosen entrances rather than the best cells.
+class HierarchicalSearch(Search):
+    def __init__(self, grid, cache=None, cluster_size=CLUSTER_SIZE):
+        super().__init__(grid)
+        self.cache = cache if cache is not None else GRAPH_CACHE
+        self.cluster_size = cluster_size
+
+    # Join the start and goals to the entrances of their clusters with edges for this query only.
+    # Added nodes are numbered from first_node, the start first (if it is not already in the graph);
+    # returns the added edges, the cell of each added node and the goal nodes.
+    def connectEndpoints(self, graph, first_node):
+        cells, cols = self.grid.cells, self.grid.cols
+        extra_edges = {}
+        extra_cells = {first_node: self.start_id}
+        goal_nodes = set()
+
+        def connect(node, cell, outgoing):
+            cluster = graph.getCluster(cell)
+            bounds = graph.getBounds(cluster)
+            distances, _, expanded = graph.searchCluster(cells, cell, bounds)
+            self.nodes_explored += expanded
+            for other in graph.cluster_nodes.get(cluster, []):
+                distance = distances[graph.getLocalIndex(graph.node_cells[other], cols, bounds)]
+                if distance > 0:
+                    if outgoing:
+                        extra_edges.setdefault(node, []).append((other, distance))
+                    else:
+                        extra_edges.setdefault(other, []).append((node, distance))
+            return distances, bounds
+
+        if self.start_id not in graph.node_ids:
+            start_distances, start_bounds = connect(first_node, self.start_id, True)
+        else:
+            start_distances = start_bounds = None
+
+        for goal in sorted(self.goal_ids):
+            if goal in graph.node_ids:
+                goal_nodes.add(graph.node_ids[goal])
+                continue
+            node = first_node + len(extra_cells)
+            extra_cells[node] = goal
+            connect(node, goal, False)
+
+            # A goal in the start's cluster may also be reached without leaving it
+            if start_bounds is not None and graph.getCluster(goal) == graph.getCluster(self.start_id):
+                distance = start_distances[graph.getLocalIndex(goal, cols, start_bounds)]
+                if distance > 0:
+                    extra_edges.setdefault(first_node, []).append((node, distance))
+            goal_nodes.add(node)
+        return extra_edges, extra_cells, goal_nodes
+
+    # Fill in the cells between two consecutive nodes of an abstract path, both in the same cluster
+    # unless they are neighbors across a border
+    def refineStep(self, graph, cell, next_cell):
+        cols = self.grid.cols
+        (y, x), (next_y, next_x) = divmod(cell, cols), divmod(next_cell, cols)
+        if abs(x - next_x) + abs(y - next_y) == 1:
+            return [next_cell]
+        bounds = graph.getBounds(graph.getCluster(cell))
+        _, parents, expanded = graph.searchCluster(self.grid.cells, cell, bounds, next_cell)
+        self.nodes_explored += expanded
+        left, top, right, _ = bounds
+        width = right - left
+        steps = []
+        local = graph.getLocalIndex(next_cell, cols, bounds)
+        while parents[local] != local:
+            y, x = divmod(local, width)
+            steps.append((top + y) * cols + left + x)
+            local = parents[local]
+        steps.reverse()
+        return steps
+
+    def hpaPath(self):
+        graph = self.cache.getGraph(self.grid, self.cluster_size)
+        if self.start_id in self.goal_ids:
+            self.nodes_explored += 1
+            self.visited_ids.append(self.start_id)
+            self.markVisited(self.start_id)
+            path = [self.start]
+            self.markFinalPath(path)
+            return True, path
+
+        # Add the start and goals to the graph for this query
+        node_count = len(graph.node_cells)
+        start_node = graph.node_ids.get(self.start_id, node_count)
+        extra_edges, extra_cells, goal_nodes = self.connectEndpoints(graph, node_count)
+
+        def nodeCell(node):
+            return graph.node_cells[node] if node < node_count else extra_cells[node]
+
+        # A* over the nodes, with the Manhattan distance to the nearest goal as the heuristic
+        g_scores = {start_node: 0}
+        parents = {start_node: start_node}
+        closed = set()
+        pq = [(self.getMinHeuristic(self.start_id), 0, start_node)]  # (f_score, -g_score, node)
+        found = None
+        while pq:
+            _, negative_g, current = heapq.heappop(pq)
+            if current in closed or -negative_g != g_scores[current]:
+                continue
+            closed.add(current)
+            cell = nodeCell(current)
+            self.nodes_explored += 1
+            self.visited_ids.append(cell)
+            self.markVisited(cell)
+            if current in goal_nodes:
+                found = current
+                break
+
+            for next_node, cost in graph.getEdges(current, extra_edges):
+                new_g = g_scores[current] + cost
+                if next_node not in g_scores or new_g < g_scores[next_node]:
+                    g_scores[next_node] = new_g
+                    parents[next_node] = current
+                    f = new_g + self.getMinHeuristic(nodeCell(next_node))
+                    heapq.heappush(pq, (f, -new_g, next_node))
+
+        if found is None:
+            # No path found
+            return False, []
+
+        # Follow the abstract path back, then refine it cluster by cluster
+        nodes = [found]
+        while parents[nodes[-1]] != nodes[-1]:
+            nodes.append(parents[nodes[-1]])
+        nodes.reverse()
+        cells = [nodeCell(nodes[0])]
+        for node in nodes[1:]:
+            cells.extend(self.refineStep(graph, cells[-1], nodeCell(node)))
+
+        path = [self.grid.position(index) for index in cells]
+        self.markFinalPath(path)
+        return True, path
+
+
+# Compare hierarchical paths with shortest paths on random queries and report the optimality gap
+def measureGap(grid, queries, seed=0, cluster_size=CLUSTER_SIZE, exact_method='bastar'):
+    from search import solveQuery
+    rng = random.Random(seed)
+    open_cells = [index for index in range(grid.rows * grid.cols) if not grid.cells[index]]
+    results = []
+    while len(results) < queries and len(open_cells) > 1:
+        start, goal = (grid.position(index) for index in rng.sample(open_cells, 2))
+        exact = solveQuery(grid, exact_method, start, [goal])
+        if not exact['found']:
+            continue
+        grid.setEndpoints(start, [goal])
+        search = HierarchicalSearch(grid, cluster_size=cluster_size)
+        start_time = time.perf_counter()
+        found, path = search.hpaPath()
+        time_ms = (time.perf_counter() - start_time) * 1000
+        if not found:
+            raise RuntimeError(f"Hierarchical search found no path from {start} to {goal}")
+        optimal = len(exact['path']) - 1
+        results.append({
+            'start': start, 'goal': goal, 'optimal': optimal, 'length': len(path) - 1,
+            'gap_percent': 100.0 * (len(path) - 1 - optimal) / optimal,
+            'time_ms': time_ms, 'nodes_explored': search.nodes_explored,
+            'exact_time_ms': exact['time_ms'], 'exact_nodes_explored': exact['nodes_explored']
+        })
+    return results
+
+
+def main():
+    from statistics import mean, median
+    from search import loadMaze
+    parser = argparse.ArgumentParser(description="Build the cluster graph of a maze and report the optimality gap of hierarchical search.")
+    parser.add_argument('maze', help="maze file (text or binary)")
+    parser.add_argument('-c', '--cluster-size', type=int, default=CLUSTER_SIZE,
+                        help=f"side of the square clusters (default: {CLUSTER_SIZE})")
+    parser.add_argument('-q', '--queries', type=int, default=50, help="random queries to compare (default: 50)")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed for the random queries (default: 0)")
+    args = parser.parse_args()
+    if args.cluster_size < 2 or args.queries < 1:
+        parser.error("Cluster size must be at least 2 and queries must be positive")
+
+    try:
+        grid = loadMaze(args.maze)
+        start_time = time.perf_counter()
+        graph = GRAPH_CACHE.getGraph(grid, args.cluster_size)
+        print(f"Cluster graph: {len(graph.node_cells):,} nodes, {len(graph.targets) // 2:,} edges, "
+              f"ready in {time.perf_counter() - start_time:.2f} s")
+        results = measureGap(grid, args.queries, args.seed, args.cluster_size)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    if not results:
+        print("No solvable queries found")
+        sys.exit(1)
+
+    gaps = [result['gap_percent'] for result in results]
+    print(f"Queries: {len(results)}")
+    print(f"Optimality gap: mean {mean(gaps):.2f}%, median {median(gaps):.2f}%, max {max(gaps):.2f}%, "
+          f"optimal on {sum(gap == 0 for gap in gaps)} of {len(gaps)}")
+    print(f"Hierarchical: median {median(r['time_ms'] for r in results):.2f} ms, "
+          f"{median(r['nodes_explored'] for r in results):,.0f} nodes explored")
+    print(f"Exact (bastar): median {median(r['exact_time_ms'] for r in results):.2f} ms, "
+          f"{median(r['exact_nodes_explored'] for r in results):,.0f} nodes explored")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
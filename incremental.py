@@ -0,0 +1,139 @@
+# Description: Lifelong Planning A* search that repairs its previous solution when walls change.
+import heapq
+from array import array
+from searchstrat import Search
+
+# Cost of an unreachable cell; larger than any path on a grid that fits in the cost arrays
+UNREACHED = 2 ** 31 - 1
+
+
+# Lifelong Planning A*, searching backward from all goals toward the start.
+# The search keeps its state between calls: after walls change through Grid.setWall, the next call only
+# revisits cells whose cost to the nearest goal may have changed, so replanning costs grow with the
+# change rather than with the maze. Changing the start or goals starts a fresh search.
+class LifelongPlanningSearch(Search):
+    def __init__(self, grid):
+        super().__init__(grid)
+        self.g_scores = None  # Settled cost from each cell to the nearest goal
+        self.rhs_scores = None  # Cost from each cell through its best neighbor, one step ahead of g_scores
+        self.open_list = []  # (key, cost, cell) for cells whose two scores differ
+        self.endpoints = None  # Start and goals the scores were computed for
+        self.change_count = 0  # Entries of the grid's change log already applied
+
+    # Manhattan distance from a cell to the start, the heuristic of the backward search
+    def getStartHeuristic(self, index):
+        y, x = divmod(index, self.grid.cols)
+        return abs(x - self.start[0]) + abs(y - self.start[1])
+
+    # Open cells next to a cell, in direction priority order: up, left, down, right
+    def getOpenNeighbors(self, index):
+        cols, cells = self.grid.cols, self.grid.cells
+        x = index % cols
+        return [next_index for next_index in (index - cols, index - 1 if x > 0 else -1,
+                                              index + cols, index + 1 if x < cols - 1 else -1)
+                if 0 <= next_index < self.size and not cells[next_index]]
+
+    # Start over from the grid's current start and goals
+    def initialize(self):
+        self.start = self.grid.start
+        self.goals = set(self.grid.goals)
+        self.start_id = self.grid.index(*self.start)
+        self.goal_ids = {self.grid.index(x, y) for x, y in self.goals}
+        self.g_scores = array('i', [UNREACHED]) * self.size
+        self.rhs_scores = array('i', [UNREACHED]) * self.size
+        self.open_list = []
+        for goal in sorted(self.goal_ids):
+            self.rhs_scores[goal] = 0
+            self.open_list.append((self.getStartHeuristic(goal), 0, goal))
+        heapq.heapify(self.open_list)
+        self.endpoints = (self.grid.start, list(self.grid.goals))
+        self.change_count = len(self.grid.changes)
+
+    # Recompute a cell's cost through its neighbors and queue it if that differs from its settled cost
+    def updateCell(self, index):
+        if index not in self.goal_ids:
+            best = UNREACHED
+            if not self.grid.cells[index]:
+                for next_index in self.getOpenNeighbors(index):
+                    if self.g_scores[next_index] + 1 < best:
+                        best = self.g_scores[next_index] + 1
+            self.rhs_scores[index] = best
+        cost = min(self.g_scores[index], self.rhs_scores[index])
+        if self.g_scores[index] != self.rhs_scores[index]:
+            heapq.heappush(self.open_list, (cost + self.getStartHeuristic(index), cost, index))
+
+    # Queue the cells affected by walls changed since the last call
+    def applyChanges(self):
+        changes = self.grid.changes
+        for index in changes[self.change_count:]:
+            self.updateCell(index)
+            for next_index in self.getOpenNeighbors(index):
+                self.updateCell(next_index)
+        self.change_count = len(changes)
+
+    # Key of a queued cell, or None if it no longer needs to be expanded
+    def getKey(self, entry):
+        _, cost, index = entry
+        g, rhs = self.g_scores[index], self.rhs_scores[index]
+        if g == rhs or cost != min(g, rhs):
+            return None
+        return cost + self.getStartHeuristic(index), cost
+
+    # Expand cells until the start's cost is settled and no queued cell could lower it
+    def computeCosts(self):
+        open_list = self.open_list
+        while open_list:
+            key = self.getKey(open_list[0])
+            if key is None:
+                heapq.heappop(open_list)  # Outdated entry
+                continue
+            # The start's key is its cost twice over, as the heuristic is zero there
+            start_cost = min(self.g_scores[self.start_id], self.rhs_scores[self.start_id])
+            if key >= (start_cost, start_cost) and self.g_scores[self.start_id] == self.rhs_scores[self.start_id]:
+                break
+
+            _, _, current = heapq.heappop(open_list)
+            self.nodes_explored += 1
+            self.visited_ids.append(current)
+            self.markVisited(current)
+
+            if self.g_scores[current] > self.rhs_scores[current]:
+                # Cost went down: settle it and let the neighbors use it
+                self.g_scores[current] = self.rhs_scores[current]
+            else:
+                # Cost went up: unsettle it and recompute it along with the neighbors
+                self.g_scores[current] = UNREACHED
+                self.updateCell(current)
+            for next_index in self.getOpenNeighbors(current):
+                self.updateCell(next_index)
+
+    # Follow decreasing costs from the start to the nearest goal
+    def extractPath(self):
+        current = self.start_id
+        path = [current]
+        while current not in self.goal_ids:
+            best = min(self.getOpenNeighbors(current), key=lambda index: self.g_scores[index])
+            if self.g_scores[best] >= self.g_scores[current]:
+                return None
+            current = best
+            path.append(current)
+        return [self.grid.position(index) for index in path]
+
+    def lpaPath(self):
+        # Plan from scratch the first time or if the endpoints moved, otherwise repair the last plan
+        self.nodes_explored = 0
+        self.visited_ids = array('i')
+        if self.endpoints != (self.grid.start, list(self.grid.goals)):
+            self.initialize()
+        else:
+            self.applyChanges()
+        self.computeCosts()
+
+        if self.g_scores[self.start_id] == UNREACHED:
+            # No path found
+            return False, []
+        path = self.extractPath()
+        if path is None:
+            return False, []
+        self.markFinalPath(path)
+        return True, path
\ No newline at end of file
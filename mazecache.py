@@ -0,0 +1,98 @@
+# Description: Cache of structures built from a maze, kept in memory by grid and on disk by maze content.
+import hashlib
+import os
+import weakref
+from collections import OrderedDict
+
+CACHE_DIR = '.maze_cache'
+
+
+# Base for caches of something built from a grid (a distance field, a cluster graph).
+# In memory, entries are found by a key naming the grid object, without reading its cells, and the least
+# recently used are dropped past max_entries. On disk, entries are stored per source maze file under a hash
+# of the content they were built from. Subclasses give the file extension and how to read and write a value.
+class MazeCache:
+    extension = ''
+
+    # A cache_dir of None keeps entries in memory only
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=4):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # Key -> (grid reference, value), least recently used first
+
+    # Get the value kept in memory for a grid under a key, or None
+    def getEntry(self, key, grid):
+        entry = self.entries.get(key)
+        if entry is None or entry[0]() is not grid:  # The grid's id may belong to a grid that was freed
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    # Keep a value in memory for a grid under a key, dropping the least recently used past the limit
+    def putEntry(self, key, grid, value):
+        self.entries[key] = (weakref.ref(grid), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    # Load the value for a grid's content from disk, or build it with build() and save it.
+    # The header names everything besides the cells the value depends on; read_args go to readValue.
+    def loadOrBuild(self, grid, header, build, *read_args):
+        if self.cache_dir is None:
+            return build()
+        key = self.contentKey(grid, header)
+        path = self.getCachePath(grid, key)
+        value = self.load(path, key, grid, *read_args)
+        if value is None:
+            value = build()
+            self.save(path, key, value)
+        return value
+
+    # Hash a grid's cells along with the header
+    @staticmethod
+    def contentKey(grid, header):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(header.encode())
+        digest.update(grid.cells)
+        return digest.hexdigest()
+
+    # Cache file for a grid: one per source maze file, so an edited file replaces its stale entry
+    def getCachePath(self, grid, key):
+        source = grid.source
+        if source:
+            name = hashlib.blake2b(os.path.abspath(source).encode(), digest_size=16).hexdigest()
+        else:
+            name = key
+        return os.path.join(self.cache_dir, name + self.extension)
+
+    # Load a cached value, or return None if it is missing or was built from different content
+    def load(self, path, key, grid, *read_args):
+        try:
+            with open(path, 'rb') as file:
+                if file.read(len(key)).decode('ascii', 'replace') != key:
+                    return None
+                return self.readValue(file, grid, *read_args)
+        except TimeoutError:
+            raise  # A run time limit, not a cache failure
+        except (OSError, EOFError):
+            return None
+
+    # Save a value with the content key it was built for
+    def save(self, path, key, value):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path, 'wb') as file:
+                file.write(key.encode('ascii'))
+                self.writeValue(file, value)
+        except TimeoutError:
+            raise
+        except OSError:
+            pass  # The cache is only an optimization
+
+    # Read a value saved by writeValue, for a grid
+    def readValue(self, file, grid, *read_args):
+        raise NotImplementedError
+
+    # Write a value after its content key
+    def writeValue(self, file, value):
+        raise NotImplementedError
\ No newline at end of file
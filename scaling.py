@@ -0,0 +1,200 @@
+# Description: Scaling benchmark that runs every engine on generated mazes from 10^2 to 10^7 cells and fits growth exponents.
+import argparse
+import json
+import math
+import os
+import sys
+from benchmark import Benchmark
+from search import SEARCH_METHODS
+from testgenerator import TestGenerator
+
+SCALING_DIR = 'scaling_cases'
+
+# Difficulties TestGenerator can generate, and those run by default
+DIFFICULTIES = ('easy', 'medium', 'hard', 'extreme')
+DEFAULT_DIFFICULTIES = ('medium', 'hard', 'extreme')
+
+# Measurements fitted against the cell count, with the benchmark field each one is read from.
+# Memory is what the search allocates on top of the loaded grid, so parsing does not hide its growth.
+METRICS = {
+    'time': ('search_ms', 'median'),
+    'nodes': ('nodes_explored', None),
+    'memory': ('search_peak_kb', None)
+}
+
+# Smallest mazes used for fitting when enough larger ones were run; below this, fixed costs dominate
+FIT_MIN_CELLS = 10 ** 4
+
+# Time exponent above which an engine is reported as superlinear, leaving room for measurement noise
+SUPERLINEAR_EXPONENT = 1.15
+
+
+class ScalingBenchmark:
+    def __init__(self, methods=None, difficulties=None, min_exponent=2, max_exponent=7, points_per_decade=2,
+                 repetitions=3, warmup=1, time_limit=60.0, seed=0, cases_dir=SCALING_DIR):
+        self.methods = list(methods or SEARCH_METHODS.keys())
+        self.difficulties = list(difficulties or DEFAULT_DIFFICULTIES)
+        self.min_exponent = min_exponent  # Smallest maze has 10^min_exponent cells
+        self.max_exponent = max_exponent  # Largest maze has 10^max_exponent cells
+        self.points_per_decade = points_per_decade
+        self.time_limit = time_limit  # Seconds; an engine slower than this is not run on larger mazes
+        self.seed = seed
+        self.cases_dir = cases_dir
+        self.benchmark = Benchmark(self.methods, repetitions, warmup)
+
+    # Square maze sizes spaced evenly on a log scale
+    def getSizes(self):
+        sizes = []
+        steps = (self.max_exponent - self.min_exponent) * self.points_per_decade
+        for step in range(steps + 1):
+            side = round(math.sqrt(10 ** (self.min_exponent + step / self.points_per_decade)))
+            if (side, side) not in sizes:
+                sizes.append((side, side))
+        return sizes
+
+    # Write a maze from TestGenerator, seeded by the benchmark seed, size and difficulty.
+    # Extreme mazes may have no path, as in the test suite; those runs are left out of the fits.
+    def generateMaze(self, rows, cols, difficulty, filename):
+        generator = TestGenerator(f"{self.seed}:{rows}x{cols}:{difficulty}")
+        generator.writeMaze(filename, rows, cols, difficulty)
+
+    # Get the maze file for a size and difficulty, generating it the first time
+    def getMazeFile(self, rows, cols, difficulty):
+        os.makedirs(self.cases_dir, exist_ok=True)
+        filename = os.path.join(self.cases_dir, f"maze_{difficulty}_{rows}x{cols}_seed{self.seed}.txt")
+        if not os.path.exists(filename):
+            self.generateMaze(rows, cols, difficulty, filename)
+        return filename
+
+    # Benchmark every engine on every size and difficulty, returning one point per run
+    def run(self, progress=True):
+        points = []
+        for difficulty in self.difficulties:
+            active = list(self.methods)
+            for rows, cols in self.getSizes():
+                if not active:
+                    break
+                filename = self.getMazeFile(rows, cols, difficulty)
+                for method in list(active):
+                    if progress:
+                        print(f"Scaling {method} on {difficulty} {rows}x{cols}...", file=sys.stderr)
+                    case = self.benchmark.benchmarkCase(filename, method)
+                    case.update(difficulty=difficulty, rows=rows, cols=cols, cells=rows * cols)
+                    points.append(case)
+
+                    # Larger mazes would only take longer
+                    if case['error'] or case['total_ms']['median'] > self.time_limit * 1000:
+                        active.remove(method)
+        return points
+
+    # Fit value = c * cells^k by least squares on a log-log scale and return k
+    @staticmethod
+    def fitExponent(cells, values):
+        pairs = [(math.log(n), math.log(v)) for n, v in zip(cells, values) if n > 0 and v > 0]
+        if len(pairs) < 2:
+            return None
+        mean_x = sum(x for x, _ in pairs) / len(pairs)
+        mean_y = sum(y for _, y in pairs) / len(pairs)
+        spread = sum((x - mean_x) ** 2 for x, _ in pairs)
+        if not spread:
+            return None
+        return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / spread
+
+    # Fit the growth exponent of each metric for every engine and difficulty
+    def fitExponents(self, points):
+        fits = []
+        for method in self.methods:
+            for difficulty in self.difficulties:
+                runs = [p for p in points if p['method'] == method and p['difficulty'] == difficulty and not p['error']]
+                # A run that finds no path stops early, so its time says nothing about how the engine scales
+                unsolved = sum(not p['found'] for p in runs)
+                runs = [p for p in runs if p['found']]
+                large_runs = [p for p in runs if p['cells'] >= FIT_MIN_CELLS]
+                if len(large_runs) >= 2:
+                    runs = large_runs
+                fit = {'method': method, 'difficulty': difficulty, 'points': len(runs), 'unsolved': unsolved,
+                       'min_cells': min((p['cells'] for p in runs), default=0),
+                       'max_cells': max((p['cells'] for p in runs), default=0)}
+                for metric, (field, statistic) in METRICS.items():
+                    values = [p[field][statistic] if statistic else p[field] for p in runs]
+                    fit[f"{metric}_exponent"] = self.fitExponent([p['cells'] for p in runs], values)
+                fit['superlinear'] = (fit['time_exponent'] or 0) > SUPERLINEAR_EXPONENT
+                fits.append(fit)
+        return fits
+
+    # Print the fitted exponents as a table
+    @staticmethod
+    def printReport(fits):
+        from tabulate import tabulate
+        headers = ['Method', 'Difficulty', 'Fitted Mazes', 'Time Exponent', 'Nodes Exponent',
+                   'Search Memory Exponent', 'Growth']
+
+        def formatExponent(exponent):
+            return '-' if exponent is None else f"{exponent:.2f}"
+
+        rows = []
+        for fit in fits:
+            fitted = f"{fit['points']} ({fit['min_cells']:,} to {fit['max_cells']:,} cells)"
+            if fit['unsolved']:
+                fitted += f", {fit['unsolved']} without a path left out"
+            rows.append([
+                fit['method'],
+                fit['difficulty'],
+                fitted,
+                formatExponent(fit['time_exponent']),
+                formatExponent(fit['nodes_exponent']),
+                formatExponent(fit['memory_exponent']),
+                'SUPERLINEAR' if fit['superlinear'] else ''
+            ])
+        print(tabulate(rows, headers=headers, tablefmt='grid'))
+
+    # Write the measurements and fits as JSON
+    def writeJson(self, points, fits, filename):
+        settings = self.benchmark.getSettings()
+        settings.update(difficulties=self.difficulties, min_exponent=self.min_exponent,
+                        max_exponent=self.max_exponent, points_per_decade=self.points_per_decade,
+                        time_limit=self.time_limit, seed=self.seed)
+        with open(filename, 'w') as file:
+            json.dump({'settings': settings, 'points': points, 'fits': fits}, file, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark how the search engines scale with maze size.")
+    parser.add_argument('-m', '--methods', help="comma-separated methods to run (default: all)")
+    parser.add_argument('-d', '--difficulties', help="comma-separated difficulties (default: medium,hard,extreme)")
+    parser.add_argument('--min-exponent', type=int, default=2, help="smallest maze has 10^N cells (default: 2)")
+    parser.add_argument('--max-exponent', type=int, default=7, help="largest maze has 10^N cells (default: 7)")
+    parser.add_argument('-p', '--points-per-decade', type=int, default=2, help="maze sizes per power of ten (default: 2)")
+    parser.add_argument('-n', '--repetitions', type=int, default=3, help="timed runs per case (default: 3)")
+    parser.add_argument('-w', '--warmup', type=int, default=1, help="untimed runs before timing (default: 1)")
+    parser.add_argument('-t', '--time-limit', type=float, default=60.0,
+                        help="stop growing an engine's mazes once a run takes longer, in seconds (default: 60)")
+    parser.add_argument('-s', '--seed', type=int, default=0, help="seed for the generated mazes (default: 0)")
+    parser.add_argument('-o', '--output', help="write the measurements and fits to this JSON file")
+    args = parser.parse_args()
+
+    methods = args.methods.lower().split(',') if args.methods else None
+    for method in methods or []:
+        if method not in SEARCH_METHODS:
+            parser.error(f"Unknown search method '{method}'. Available methods: {', '.join(SEARCH_METHODS)}")
+    difficulties = args.difficulties.lower().split(',') if args.difficulties else None
+    for difficulty in difficulties or []:
+        if difficulty not in DIFFICULTIES:
+            parser.error(f"Unknown difficulty '{difficulty}'. Available difficulties: {', '.join(DIFFICULTIES)}")
+    if not 1 <= args.min_exponent <= args.max_exponent or args.points_per_decade < 1:
+        parser.error("Exponents must satisfy 1 <= min <= max, and points per decade must be positive")
+    if args.repetitions < 1 or args.warmup < 0 or args.time_limit <= 0:
+        parser.error("Repetitions and time limit must be positive, and warmup cannot be negative")
+
+    scaling = ScalingBenchmark(methods, difficulties, args.min_exponent, args.max_exponent, args.points_per_decade,
+                               args.repetitions, args.warmup, args.time_limit, args.seed)
+    points = scaling.run()
+    fits = scaling.fitExponents(points)
+    scaling.printReport(fits)
+    if args.output:
+        scaling.writeJson(points, fits, args.output)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,28 +1,69 @@
 import sys
 import os
 import time
-from grid import Grid
+import importlib
 from fileRead import FileRead
-from testSuiteExtension import TestSuiteExtension
-from searchstrat import (
-    BreadthFirstSearch,
-    DepthFirstSearch,
-    AStarSearch,
-    GreedyBestFirstSearch,
-    BidirectionalSearch,
-    BeamSearch
-)
-
-# Map of search method strings to their corresponding classes, method names, and full names
+
+# Only what the solve path needs is imported at startup. The test suite (pandas, psutil,
+# tabulate) and the server are imported by their own modes, and each engine's module is
+# imported the first time that engine is used.
+
+# Map of search method strings to their modules, class names, method names, and full names
 SEARCH_METHODS = {
-    'bfs': (BreadthFirstSearch, 'bfsPath', 'Breadth First Search'),
-    'dfs': (DepthFirstSearch, 'dfsPath', 'Depth First Search'),
-    'astar': (AStarSearch, 'astarPath', 'A* Search'),
-    'gbfs': (GreedyBestFirstSearch, 'gbfsPath', 'Greedy Best First Search'),
-    'bdfs': (BidirectionalSearch, 'bdsPath', 'Bidirectional Search'),
-    'bs': (BeamSearch, 'beamPath', 'Beam Search')
+    'bfs': ('searchstrat', 'BreadthFirstSearch', 'bfsPath', 'Breadth First Search'),
+    'dfs': ('searchstrat', 'DepthFirstSearch', 'dfsPath', 'Depth First Search'),
+    'astar': ('searchstrat', 'AStarSearch', 'astarPath', 'A* Search'),
+    'bastar': ('searchstrat', 'BidirectionalAStarSearch', 'bastarPath', 'Bidirectional A* Search'),
+    'jps': ('searchstrat', 'JumpPointSearch', 'jpsPath', 'Jump Point Search'),
+    'gbfs': ('searchstrat', 'GreedyBestFirstSearch', 'gbfsPath', 'Greedy Best First Search'),
+    'bdfs': ('searchstrat', 'BidirectionalSearch', 'bdsPath', 'Bidirectional Search'),
+    'mbds': ('searchstrat', 'MultiGoalBidirectionalSearch', 'mbdsPath', 'Multi-Goal Bidirectional Search'),
+    'bs': ('searchstrat', 'BeamSearch', 'beamPath', 'Beam Search'),
+    'wbfs': ('wavefront', 'WavefrontSearch', 'wavefrontPath', 'Wavefront Breadth First Search'),
+    'dfield': ('distancefield', 'DistanceFieldSearch', 'fieldPath', 'Distance Field Search'),
+    'lpa': ('incremental', 'LifelongPlanningSearch', 'lpaPath', 'Lifelong Planning A* Search'),
+    'hpa': ('hierarchical', 'HierarchicalSearch', 'hpaPath', 'Hierarchical Pathfinding A*')
+}
+
+# Methods whose search objects keep their state between queries on the same grid
+INCREMENTAL_METHODS = {'lpa'}
+
+# Methods whose engines keep what they build for later queries, with the module and class of their cache
+ENGINE_CACHES = {
+    'dfield': ('distancefield', 'DistanceFieldCache'),
+    'hpa': ('hierarchical', 'ClusterGraphCache')
 }
 
+# Import time allowed for this module on top of a bare interpreter start, in milliseconds
+STARTUP_BUDGET_MS = 50
+
+def loadEngine(method):
+    # Import the module implementing a search method and return its class and method name
+    module_name, class_name, method_name = SEARCH_METHODS[method][:3]
+    return getattr(importlib.import_module(module_name), class_name), method_name
+
+def checkStartupTime(budget_ms=STARTUP_BUDGET_MS, runs=5):
+    # Time a fresh interpreter importing this module against a bare one (median of several runs)
+    # Returns whether the extra startup time is within budget
+    import subprocess
+    from statistics import median
+
+    def timeCommand(code):
+        times = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
+            times.append((time.perf_counter() - start_time) * 1000)
+        return median(times)
+
+    base_ms = timeCommand('pass')
+    import_ms = timeCommand('import search, searchstrat') - base_ms
+    within_budget = import_ms <= budget_ms
+    print(f"Startup: {import_ms:.1f} ms over a bare interpreter ({base_ms:.1f} ms), "
+          f"budget {budget_ms:g} ms: {'OK' if within_budget else 'OVER BUDGET'}")
+    return within_budget
+
 def convertPathToMoves(path):
     # Convert a path to a list of moves
     moves = []
@@ -41,25 +82,167 @@ def convertPathToMoves(path):
     
     return moves
 
-def printMazeOnly(filename):
-    # Print only the maze structure from the file
+def loadMaze(filename):
+    # Read and parse a maze file into a grid, looking in test_cases if the path does not exist
     try:
         if not os.path.isfile(filename):
             filename = os.path.join('test_cases', filename)
-        lines = FileRead.readFile(filename)
-        config = FileRead.parseGridInfo(lines)
-        grid = Grid(config['dimensions'], config['start'], config['goals'], config['walls'])
-        print(f"\nMaze from {filename}:")
-        grid.display()
+        if FileRead.isBinaryMaze(filename):
+            grid = FileRead.loadBinaryGrid(filename)
+        else:
+            grid = FileRead.loadGrid(filename)
     except FileNotFoundError:
         raise FileNotFoundError(f"Could not find file {filename}")
     except Exception as e:
         raise Exception(f"Error parsing file: {str(e)}")
 
+    grid.source = filename
+    return grid
+
+def createMemoryCache(method):
+    # Create an empty cache for a method's engine that is kept in memory only, for runs that should
+    # neither reuse earlier results nor write cache files
+    module_name, class_name = ENGINE_CACHES[method]
+    return getattr(importlib.import_module(module_name), class_name)(cache_dir=None)
+
+def createSearch(grid, method, beam_width=2):
+    # Create the search object for a method on a grid
+    # Validate search method
+    if method not in SEARCH_METHODS:
+        raise ValueError(
+            f"Unknown search method '{method}'\n"
+            f"Available methods: {', '.join(SEARCH_METHODS.keys())}"
+        )
+    search_class = loadEngine(method)[0]
+
+    # Initialize search with beam width if it's beam search
+    if method == 'bs':
+        return search_class(grid, beam_width=beam_width)
+    return search_class(grid)
+
+def solveQuery(grid, method, start=None, goals=None, beam_width=2, search=None):
+    # Solve one query on an already loaded grid, reusing its cached structures
+    # Start and goals default to the grid's current ones
+    # A search object kept from an earlier query on the grid can be given to run again (for lpa, to repair its plan)
+    start = grid.start if start is None else start
+    goals = grid.goals if goals is None else goals
+    FileRead.validatePosition(start, grid.rows, grid.cols, "Start")
+    for goal in goals:
+        FileRead.validatePosition(goal, grid.rows, grid.cols, "Goal")
+    if (start, goals) != (grid.start, grid.goals):
+        grid.setEndpoints(start, goals)
+    else:
+        grid.reset()
+
+    if search is None:
+        search = createSearch(grid, method, beam_width)
+    start_time = time.perf_counter()
+    found, path = getattr(search, SEARCH_METHODS[method][2])()
+    time_taken_ms = (time.perf_counter() - start_time) * 1000
+
+    return {
+        'method': method,
+        'start': start,
+        'found': found,
+        'goal': path[-1] if found else None,
+        'nodes_explored': search.nodes_explored,
+        'path': path,
+        'moves': convertPathToMoves(path),
+        'time_ms': time_taken_ms,
+        'error': None
+    }
+
+def runBatch(filename, queries):
+    # Load a maze once and solve a stream of (start, goals, method[, beam_width]) queries on it,
+    # yielding one result per query as soon as it is solved
+    # A query can also be a query line, parsed with parseQuery
+    # A start or goals of None means the ones from the maze file
+    # An invalid query yields a result with its error and the batch carries on
+    grid = loadMaze(filename)
+    default_start, default_goals = grid.start, grid.goals
+
+    for query in queries:
+        start = method = None
+        try:
+            if isinstance(query, str):
+                query = parseQuery(query)
+            start, goals, method = query[:3]
+            beam_width = validateBeamWidth(query[3]) if len(query) > 3 else 2
+            start = default_start if start is None else start
+            goals = default_goals if goals is None else goals
+            yield solveQuery(grid, method, start, goals, beam_width)
+        except ValueError as e:
+            yield {'method': method, 'start': start, 'found': False, 'error': str(e)}
+
+def validateBeamWidth(beam_width):
+    # Beam widths must be positive integers
+    if isinstance(beam_width, bool) or not isinstance(beam_width, int) or beam_width < 1:
+        raise ValueError(f"Beam width must be a positive integer, got {beam_width!r}")
+    return beam_width
+
+def parseQuery(line):
+    # Parse a query line: <start> <method> [beam_width] [goal|goal|...]
+    # e.g. "(0,1) astar" or "(0,1) bs 3 (7,0)|(10,3)"
+    parts = line.split()
+    if len(parts) < 2:
+        raise ValueError(f"Invalid query '{line}': expected <start> <method> [beam_width] [goals]")
+    try:
+        start = parseQueryPosition(parts[0])
+        method = parts[1].lower()
+        rest = parts[2:]
+        beam_width = 2
+        if rest and rest[0].isdigit():
+            beam_width = validateBeamWidth(int(rest.pop(0)))
+        goals = None
+        if rest:
+            goals = [parseQueryPosition(goal) for goal in ' '.join(rest).split('|')]
+    except ValueError as e:
+        raise ValueError(f"Invalid query '{line}': {e}")
+    return start, goals, method, beam_width
+
+def parseQueryPosition(text):
+    # Parse an (x,y) position, rejecting anything else
+    text = text.strip()
+    try:
+        if not (text.startswith('(') and text.endswith(')')):
+            raise ValueError
+        position = FileRead.parsePosition(text)
+        if len(position) != 2:
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"position '{text}' is not of the form (x,y)") from None
+    return position
+
+def runBatchFile(filename, query_lines):
+    # Solve query lines against one maze, printing one result line per query
+    # Lines are parsed by runBatch, so a malformed line gets an error result instead of ending the batch
+    def queries():
+        for line in query_lines:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+    for result in runBatch(filename, queries()):
+        prefix = f"{result['start']} {result['method']}"
+        if result['error']:
+            # Lines that could not be parsed have no start to show
+            error = f"Error: {result['error']}" if result['start'] is None else f"{prefix} Error: {result['error']}"
+            print(error.replace('\n', ' '), flush=True)
+        elif result['found']:
+            print(f"{prefix} {result['goal']} {result['nodes_explored']} {' '.join(result['moves'])}", flush=True)
+        else:
+            print(f"{prefix} No goal is reachable; {result['nodes_explored']}", flush=True)
+
+def printMazeOnly(filename):
+    # Print only the maze structure from the file
+    grid = loadMaze(filename)
+    print(f"\nMaze from {grid.source}:")
+    grid.display()
+
 def printDetailedOutput(grid, method, found, path, nodes_explored, visited_order, time_taken_ms):
     # Print detailed output for debugging and verification
     print("\n--- To Check ---")
-    print(f"\nGrid after {SEARCH_METHODS[method][2]} search:")
+    print(f"\nGrid after {SEARCH_METHODS[method][3]} search:")
     grid.display()
     print(f"\nPath found: {found}")
     if found:
@@ -78,26 +261,11 @@ def runSearch(filename, method, beam_width=2):
             f"Available methods: {', '.join(SEARCH_METHODS.keys())}"
         )
 
-    # Read and parse the maze file
-    try:
-        if not os.path.isfile(filename):
-            filename = os.path.join('test_cases', filename)
-        lines = FileRead.readFile(filename)
-        config = FileRead.parseGridInfo(lines)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"Could not find file {filename}")
-    except Exception as e:
-        raise Exception(f"Error parsing file: {str(e)}")
-
-    # Create the grid and initialize search
-    grid = Grid(config['dimensions'], config['start'], config['goals'], config['walls'])
-    search_class, search_method = SEARCH_METHODS[method][:2]
-    
-    # Initialize search with beam width if it's beam search
-    if method == 'bs':
-        search = search_class(grid, beam_width=beam_width)
-    else:
-        search = search_class(grid)
+    # Read and parse the maze file, then create the grid and initialize search
+    grid = loadMaze(filename)
+    filename = grid.source
+    search = createSearch(grid, method, beam_width)
+    search_method = SEARCH_METHODS[method][2]
     
     # Start timing using perf_counter for better precision
     start_time = time.perf_counter()
@@ -109,7 +277,7 @@ def runSearch(filename, method, beam_width=2):
     time_taken_ms = (time.perf_counter() - start_time) * 1000
 
     # Print required assignment format output
-    print(f"{filename} {SEARCH_METHODS[method][2]}")
+    print(f"{filename} {SEARCH_METHODS[method][3]}")
     
     if found:
         goal = path[-1]  # Get the reached goal (last position in path)
@@ -130,10 +298,23 @@ def printUsage():
     # Print usage instructions
     print("Usage:")
     print("1. Regular mode: python search.py <filename> <method> [beam_width]")
-    print("2. Test mode: python search.py --test")
+    print("2. Test mode: python search.py --test [workers] [timeout_seconds] [seed]")
+    print("   Runs the tests on a pool of worker processes if workers > 1, failing any run over the timeout (0 for none)")
+    print("   A seed makes the generated test mazes reproducible")
     print("3. Print maze: python search.py --print <filename>")
+    print("4. Batch mode: python search.py --batch <filename> [queries_file]")
+    print("   One query per line: <start> <method> [beam_width] [goal|goal|...], read from stdin if no file is given")
+    print("5. Server mode: python search.py --serve [socket_path]")
+    print("   JSON-lines requests (load, solve, walls, unload, list) on stdin, or on a Unix socket if a path is given")
+    print(f"6. Startup check: python search.py --startup-check [budget_ms] (default {STARTUP_BUDGET_MS} ms)")
+    print("7. Convert to binary: python search.py --convert <text_file> <binary_file>")
+    print("   Binary mazes are memory-mapped when loaded and can be used wherever a maze file is expected")
+    print("8. Generate a maze: python search.py --generate <rows> <cols> <output_file> [difficulty] [seed]")
+    print("   Difficulty is easy, medium, hard or extreme (default medium); a .bin output file is written in binary")
+    print("9. Stream a maze: python search.py --generate-stream <rows> <cols> <output_file> [seed]")
+    print("   Writes a perfect maze row by row without holding it in memory, for mazes larger than memory")
     print("\nAvailable methods:")
-    for short_name, (_, _, full_name) in SEARCH_METHODS.items():
+    for short_name, (_, _, _, full_name) in SEARCH_METHODS.items():
         print(f"  {short_name}: {full_name}")
     print("\nFor Beam Search, beam width is defaulted at 2, but can be changed with the following command:")
     print("Example: python search.py maze.txt bs 3")
@@ -142,10 +323,84 @@ def main():
     if len(sys.argv) == 1:
         printUsage()
         sys.exit(1)
-    elif len(sys.argv) == 2 and sys.argv[1] == '--test':
+    elif 2 <= len(sys.argv) <= 5 and sys.argv[1] == '--test':
         from testSuiteExtension import TestSuiteExtension 
-        test_suite = TestSuiteExtension()
+        try:
+            workers = int(sys.argv[2]) if len(sys.argv) >= 3 else 1
+            timeout = float(sys.argv[3]) if len(sys.argv) >= 4 else 0
+            seed = int(sys.argv[4]) if len(sys.argv) == 5 else None
+            if workers < 1 or timeout < 0:
+                raise ValueError("Workers must be positive and timeout cannot be negative")
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+        test_suite = TestSuiteExtension(workers, timeout or None, seed)
         test_suite.runTestSuite()
+    elif 5 <= len(sys.argv) <= 7 and sys.argv[1] == '--generate':
+        from testgenerator import TestGenerator
+        try:
+            rows, cols = int(sys.argv[2]), int(sys.argv[3])
+            difficulty = sys.argv[5].lower() if len(sys.argv) >= 6 else 'medium'
+            seed = int(sys.argv[6]) if len(sys.argv) == 7 else None
+            if rows < 3 or cols < 3:
+                raise ValueError("Mazes must be at least 3x3")
+            if difficulty not in ('easy', 'medium', 'hard', 'extreme'):
+                raise ValueError(f"Unknown difficulty '{difficulty}'. Available difficulties: easy, medium, hard, extreme")
+            TestGenerator(seed).writeMaze(sys.argv[4], rows, cols, difficulty)
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+    elif len(sys.argv) in (5, 6) and sys.argv[1] == '--generate-stream':
+        from testgenerator import TestGenerator
+        try:
+            rows, cols = int(sys.argv[2]), int(sys.argv[3])
+            seed = int(sys.argv[5]) if len(sys.argv) == 6 else None
+            if rows < 3 or cols < 3:
+                raise ValueError("Mazes must be at least 3x3")
+            TestGenerator(seed).writeStreamingMaze(sys.argv[4], rows, cols)
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+    elif len(sys.argv) in (3, 4) and sys.argv[1] == '--batch':
+        try:
+            if len(sys.argv) == 4 and sys.argv[3] != '-':
+                with open(sys.argv[3], 'r') as query_file:
+                    runBatchFile(sys.argv[2], query_file)
+            else:
+                runBatchFile(sys.argv[2], sys.stdin)
+        except (ValueError, FileNotFoundError, Exception) as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == '--startup-check':
+        try:
+            budget_ms = float(sys.argv[2]) if len(sys.argv) == 3 else STARTUP_BUDGET_MS
+            if not budget_ms >= 0 or budget_ms == float('inf'):
+                raise ValueError
+        except ValueError:
+            print(f"Error: Startup budget must be a non-negative number of milliseconds, got '{sys.argv[2]}'\n")
+            printUsage()
+            sys.exit(1)
+        if not checkStartupTime(budget_ms):
+            sys.exit(1)
+    elif len(sys.argv) == 4 and sys.argv[1] == '--convert':
+        try:
+            FileRead.convertToBinary(sys.argv[2], sys.argv[3])
+        except (ValueError, FileNotFoundError, Exception) as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == '--serve':
+        from server import SolverServer
+        solver = SolverServer()
+        try:
+            if len(sys.argv) == 3:
+                solver.serveSocket(sys.argv[2])
+            else:
+                solver.serveStream(sys.stdin, sys.stdout)
+        except KeyboardInterrupt:
+            pass
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+            sys.exit(1)
     elif len(sys.argv) == 3 and sys.argv[1] == '--print':
         try:
             printMazeOnly(sys.argv[2])
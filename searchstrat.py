@@ -1,91 +1,131 @@
 # Description: This file contains the search algorithms.
 import heapq
+from array import array
+from bisect import bisect_left
 from collections import deque
+from bitset import BitSet
+
+# Goal count from which heuristic searches read the nearest-goal distance from a
+# precomputed field instead of measuring the distance to every goal. Filling a row of the
+# field costs about as much as a few direct minimums, so on 2000x2000 maps A* and GBFS only
+# came out ahead with the field from about 5000 goals
+GOAL_FIELD_MIN_GOALS = 5000
 
 # Parent class for search algorithms holding common functions and variables
 class Search:
     # Initialize the search algorithm
     def __init__(self, grid):
         self.grid = grid
-        self.visited = set()
+        self.size = grid.rows * grid.cols
+        self.visited = BitSet(self.size)
+        self.parents = None  # Predecessor index of each discovered cell, created by each search
         self.nodes_explored = 0
-        self.visited_order = []
+        self.visited_ids = array('i')  # Cell indices in the order they were visited
         self.start = self.grid.start
         self.goals = set(self.grid.goals)
+        # Searches work on flat cell indices; positions are only used at the API boundary
+        self.start_id = grid.index(*self.start)
+        self.goal_ids = {grid.index(x, y) for x, y in self.goals}
+        self.goal_field = None  # Shared nearest-goal field from the grid, fetched on first use
         self.directions = [(0, -1), (-1, 0), (0, 1), (1, 0)] # Direction priority: up, left, down, right
 
-    # Check if position is within bounds, unvisited, and not a wall
-    def isValidMove(self, x, y):
-        return (0 <= x < self.grid.cols and 
-                0 <= y < self.grid.rows and 
-                (x, y) not in self.visited and 
-                self.grid.grid[y][x] != '#')
+    # Positions in the order they were visited
+    @property
+    def visited_order(self):
+        return [self.grid.position(index) for index in self.visited_ids]
 
     # Mark the final path on grid
     def markFinalPath(self, path):
         for x, y in path:
-            if self.grid.grid[y][x] == 'V':
-                self.grid.grid[y][x] = 'P'
+            if self.grid.getSymbol(x, y) == 'V':
+                self.grid.setSymbol(x, y, 'P')
             elif (x, y) in self.grid.goals:
-                self.grid.grid[y][x] = 'G'
+                self.grid.setSymbol(x, y, 'G')
 
-    # Mark visited position on grid
-    def markVisited(self, x, y):
-        if self.grid.grid[y][x] == '•':
-            self.grid.grid[y][x] = 'V'
+    # Mark visited cell on grid
+    def markVisited(self, index):
+        if self.grid.getSymbolAt(index) == '•':
+            self.grid.setSymbolAt(index, 'V')
 
-    # Check if current position is a goal
-    def isGoal(self, position):
-        return position in self.goals
+    # Check if current cell is a goal
+    def isGoal(self, index):
+        return index in self.goal_ids
 
-    # Get valid neighbors of current position
-    def getNeighbors(self, x, y, path):
+    # Get valid neighbors of current cell: within bounds, unvisited, and not a wall
+    def getNeighbors(self, index):
+        cols, rows = self.grid.cols, self.grid.rows
+        y, x = divmod(index, cols)
         valid_neighbors = []
         for dx, dy in self.directions:
             next_x, next_y = x + dx, y + dy
-            next_pos = (next_x, next_y)
-            
-            if self.isValidMove(next_x, next_y):
-                valid_neighbors.append((next_pos, path + [(x, y)]))
+
+            if 0 <= next_x < cols and 0 <= next_y < rows:
+                next_index = next_y * cols + next_x
+                if not self.grid.cells[next_index] and next_index not in self.visited:
+                    valid_neighbors.append(next_index)
         return valid_neighbors
 
+    # Create a predecessor array with every cell undiscovered (-1)
+    def createParents(self):
+        return array('i', [-1]) * self.size
+
+    # Rebuild the path to a cell by following predecessor links back to the root,
+    # which is its own predecessor
+    def reconstructPath(self, index, parents=None):
+        if parents is None:
+            parents = self.parents
+        path = [index]
+        while parents[index] != index:
+            index = parents[index]
+            path.append(index)
+        path.reverse()
+        return [self.grid.position(i) for i in path]
+
     # Calculate Manhattan distance between current position and goal
     def calculateHeuristic(self, current, goal):
         x1, y1 = current
         x2, y2 = goal
         return abs(x1 - x2) + abs(y1 - y2)
 
-    # Find minimum Manhattan distance to any goal
-    def getMinHeuristic(self, pos):
-        return min(self.calculateHeuristic(pos, goal) for goal in self.goals)
+    # Find minimum Manhattan distance from a cell to any goal
+    def getMinHeuristic(self, index):
+        if len(self.goals) >= GOAL_FIELD_MIN_GOALS:
+            if self.goal_field is None:
+                self.goal_field = self.grid.getGoalDistanceField()
+            return self.goal_field[index]
+        y, x = divmod(index, self.grid.cols)
+        return min(abs(x - gx) + abs(y - gy) for gx, gy in self.goals)
 
 
 # Search algorithms
 # Breadth-first search
 class BreadthFirstSearch(Search):
     def bfsPath(self):
-        # Initialize queue with start position and empty path
-        queue = deque([(self.start, [])])
-        self.visited.add(self.start)
-        self.visited_order.append(self.start)
+        # Initialize queue with start cell, which is its own predecessor
+        queue = deque([self.start_id])
+        self.parents = self.createParents()
+        self.parents[self.start_id] = self.start_id
+        self.visited.add(self.start_id)
+        self.visited_ids.append(self.start_id)
 
         while queue:
-            # Get next position and path from front of queue
-            (x, y), path = queue.popleft()
+            # Get next cell from front of queue
+            current = queue.popleft()
             self.nodes_explored += 1
-            self.markVisited(x, y)
+            self.markVisited(current)
 
-            # Check if current position is a goal
-            if self.isGoal((x, y)):
-                self.markFinalPath(path + [(x, y)])
-                return True, path + [(x, y)]
+            # Check if current cell is a goal
+            if self.isGoal(current):
+                path = self.reconstructPath(current)
+                self.markFinalPath(path)
+                return True, path
 
             # Get valid neighbors and add to queue
-            neighbors = self.getNeighbors(x, y, path)
-            for next_pos, new_path in neighbors:
-                self.visited.add(next_pos)
-                self.visited_order.append(next_pos)
-                queue.append((next_pos, new_path))
+            for next_index in self.getNeighbors(current):
+                self.visited.add(next_index)
+                self.visited_ids.append(next_index)
+                self.parents[next_index] = current
+                queue.append(next_index)
 
         # No path found
         return False, []
@@ -94,39 +134,45 @@ class BreadthFirstSearch(Search):
 # Depth-first search
 class DepthFirstSearch(Search):
     def dfsPath(self):
-        # Initialize stack with start position and initial path
-        stack = [(self.start, [self.start])]
-        self.visited = set()
-        self.visited_order = []
+        # Initialize stack with start cell and the cell it was reached from (itself)
+        stack = [(self.start_id, self.start_id)]
+        self.visited = BitSet(self.size)
+        self.visited_ids = array('i')
+        self.parents = self.createParents()
+        cols, rows = self.grid.cols, self.grid.rows
 
         while stack:
-            # Get position and path from top of stack
-            (x, y), path = stack.pop()
-            
-            # Process unvisited positions
-            if (x, y) not in self.visited:
-                self.nodes_explored += 1
-                self.markVisited(x, y)
-                self.visited.add((x, y))
-                self.visited_order.append((x, y))
+            # Get cell and its predecessor from top of stack
+            current, parent = stack.pop()
 
-                # Check if current position is goal
-                if self.isGoal((x, y)):
+            # Process unvisited cells
+            if current not in self.visited:
+                self.nodes_explored += 1
+                self.markVisited(current)
+                self.visited.add(current)
+                self.visited_ids.append(current)
+                # The first time a cell is popped fixes its predecessor
+                self.parents[current] = parent
+
+                # Check if current cell is goal
+                if self.isGoal(current):
+                    path = self.reconstructPath(current)
                     self.markFinalPath(path)
                     return True, path
 
                 # Check neighbors in reverse direction order
+                y, x = divmod(current, cols)
                 for dx, dy in reversed(self.directions):
                     next_x, next_y = x + dx, y + dy
-                    next_pos = (next_x, next_y)
+                    next_index = next_y * cols + next_x
 
                     # Add valid neighbors to stack
-                    if (0 <= next_x < self.grid.cols and 
-                        0 <= next_y < self.grid.rows and 
-                        next_pos not in self.visited and 
-                        self.grid.grid[next_y][next_x] != '#'):
+                    if (0 <= next_x < cols and
+                        0 <= next_y < rows and
+                        next_index not in self.visited and
+                        not self.grid.cells[next_index]):
 
-                        stack.append((next_pos, path + [next_pos]))
+                        stack.append((next_index, current))
 
         # No path found
         return False, []
@@ -136,44 +182,235 @@ class DepthFirstSearch(Search):
 class AStarSearch(Search):
     def astarPath(self):
         # Initialize priority queue with start state
-        start_h = self.getMinHeuristic(self.start)
-        pq = [(start_h, 0, self.start, [])]  # (f_score, nodes_explored, position, path)
-        g_scores = {self.start: 0}  # Track cost to reach each node
-        
-        self.visited.add(self.start)
-        self.visited_order.append(self.start)
+        # Ties on f_score are broken by position (x, then y) after insertion order
+        start_h = self.getMinHeuristic(self.start_id)
+        start_x, start_y = self.start
+        pq = [(start_h, 0, start_x, start_y, self.start_id)]  # (f_score, nodes_explored, x, y, cell)
+        g_scores = array('i', [-1]) * self.size  # Track cost to reach each cell, -1 if unreached
+        g_scores[self.start_id] = 0
+        self.parents = self.createParents()
+        self.parents[self.start_id] = self.start_id
+
+        self.visited.add(self.start_id)
+        self.visited_ids.append(self.start_id)
+        cols = self.grid.cols
 
         while pq:
             # Get node with lowest f_score from priority queue
-            f, _, (x, y), path = heapq.heappop(pq)
-            current_g = g_scores[(x, y)]  # Current path cost
-            
+            f, _, _, _, current = heapq.heappop(pq)
+            current_g = g_scores[current]  # Current path cost
+
             self.nodes_explored += 1
-            self.markVisited(x, y)
+            self.markVisited(current)
 
             # Check if current node is goal
-            if self.isGoal((x, y)):
-                self.markFinalPath(path + [(x, y)])
-                return True, path + [(x, y)]
-
-            # Check all neighboring positions
-            for dx, dy in self.directions:
-                next_x, next_y = x + dx, y + dy
-                next_pos = (next_x, next_y)
-                
-                if self.isValidMove(next_x, next_y):
-                    new_g = current_g + 1  # Cost to reach neighbor
-                    
-                    # Update if new path is better
-                    if next_pos not in g_scores or new_g < g_scores[next_pos]:
-                        g_scores[next_pos] = new_g
-                        h = self.getMinHeuristic(next_pos)
-                        f = new_g + h  # Calculate f_score
-                        
-                        self.visited.add(next_pos)
-                        self.visited_order.append(next_pos)
-                        
-                        heapq.heappush(pq, (f, self.nodes_explored, next_pos, path + [(x, y)]))
+            if self.isGoal(current):
+                path = self.reconstructPath(current)
+                self.markFinalPath(path)
+                return True, path
+
+            # Check all neighboring cells
+            for next_index in self.getNeighbors(current):
+                new_g = current_g + 1  # Cost to reach neighbor
+
+                # Update if new path is better
+                if g_scores[next_index] < 0 or new_g < g_scores[next_index]:
+                    g_scores[next_index] = new_g
+                    h = self.getMinHeuristic(next_index)
+                    f = new_g + h  # Calculate f_score
+
+                    self.visited.add(next_index)
+                    self.visited_ids.append(next_index)
+                    self.parents[next_index] = current
+
+                    next_y, next_x = divmod(next_index, cols)
+                    heapq.heappush(pq, (f, self.nodes_explored, next_x, next_y, next_index))
+
+        # No path found
+        return False, []
+
+
+# Jump point search on the 4-connected uniform-cost grid
+class JumpPointSearch(Search):
+    def __init__(self, grid):
+        super().__init__(grid)
+        # Scan results per direction and cell: the jump point found scanning from that cell,
+        # -1 if the scan runs into a wall, -2 if not scanned yet. A scan ends the same way
+        # wherever it starts along a line, so every cell it passes over shares its result.
+        self.jumps = {direction: array('i', [-2]) * self.size for direction in self.directions}
+        self.goal_list = sorted(self.goal_ids)  # Goal cells in index order, to find the goals along a row
+        self.scan_cells = None  # Occupancy as bytes or a bytearray, which horizontal scans search in C
+
+    # Scan from a cell in one direction and return the first jump point, or -1
+    def jump(self, index, dx, dy):
+        cache = self.jumps[dx, dy]
+        if cache[index] != -2:
+            return cache[index]
+        if dx:
+            result, last = self.jumpAcross(index, dx)
+        else:
+            result, last = self.jumpDown(index, dy)
+
+        # Share the result with every cell the scan started from or passed over
+        if last == index:
+            cache[index] = result
+        else:
+            step = abs(dx + dy * self.grid.cols)
+            low = min(index, last)
+            count = abs(last - index) // step + 1
+            cache[low:low + (count - 1) * step + 1:step] = array('i', [result]) * count
+        return result
+
+    # Scan along a row, returning the jump point (or -1) and the last cell the scan passed over.
+    # The open run, the goals in it and the forced neighbors (an open cell above or below right after
+    # a wall, seen in the direction of the scan) are each found with one search of the row, so the
+    # scan does not step through the run in Python.
+    def jumpAcross(self, index, dx):
+        cols, cells = self.grid.cols, self.scan_cells
+        row_start = index - index % cols
+        above, below = index >= cols, index < self.size - cols
+        goals = self.goal_list
+        if dx > 0:
+            wall = cells.find(b'\x01', index + 1, row_start + cols)
+            first, last = index + 1, (wall if wall >= 0 else row_start + cols) - 1
+            if last < first:
+                return -1, index
+            found = [last + 1]
+            position = bisect_left(goals, first)
+            if position < len(goals) and goals[position] <= last:
+                found.append(goals[position])
+            if above:
+                side = cells.find(b'\x01\x00', first - cols - 1, last - cols + 1)
+                if side >= 0:
+                    found.append(side + cols + 1)
+            if below:
+                side = cells.find(b'\x01\x00', first + cols - 1, last + cols + 1)
+                if side >= 0:
+                    found.append(side - cols + 1)
+            result = min(found)
+            if result > last:
+                return -1, last
+            return result, result - 1
+
+        wall = cells.rfind(b'\x01', row_start, index)
+        first, last = index - 1, (wall if wall >= 0 else row_start - 1) + 1
+        if first < last:
+            return -1, index
+        found = [last - 1]
+        position = bisect_left(goals, first + 1) - 1
+        if position >= 0 and goals[position] >= last:
+            found.append(goals[position])
+        if above:
+            side = cells.rfind(b'\x00\x01', last - cols, first - cols + 2)
+            if side >= 0:
+                found.append(side + cols)
+        if below:
+            side = cells.rfind(b'\x00\x01', last + cols, first + cols + 2)
+            if side >= 0:
+                found.append(side - cols)
+        result = max(found)
+        if result < last:
+            return -1, last
+        return result, result + 1
+
+    # Scan along a column, returning the jump point (or -1) and the last cell the scan passed over.
+    # Vertical moves may also only turn where a horizontal scan would find a jump point.
+    def jumpDown(self, index, dy):
+        cols, cells, size, goal_ids = self.grid.cols, self.grid.cells, self.size, self.goal_ids
+        step = dy * cols
+        x = index % cols
+        left, right = x > 0, x < cols - 1
+        right_jumps, left_jumps = self.jumps[1, 0], self.jumps[-1, 0]
+        current = index
+        while True:
+            next_index = current + step
+            if not 0 <= next_index < size or cells[next_index]:
+                return -1, current
+            current = next_index
+            if current in goal_ids:
+                return current, current - step
+            # Forced neighbor: an open side cell whose cell behind is a wall
+            if (left and not cells[current - 1] and cells[current - 1 - step]) or \
+                    (right and not cells[current + 1] and cells[current + 1 - step]):
+                return current, current - step
+            result = right_jumps[current]
+            if result == -2:
+                result = self.jump(current, 1, 0)
+            if result < 0:
+                result = left_jumps[current]
+                if result == -2:
+                    result = self.jump(current, -1, 0)
+            if result >= 0:
+                return current, current - step
+
+    # Get the directions worth following from a jump point, pruning symmetric paths
+    def getJumpDirections(self, index):
+        parent = self.parents[index]
+        if parent == index:
+            return self.directions
+        y, x = divmod(index, self.grid.cols)
+        parent_y, parent_x = divmod(parent, self.grid.cols)
+        if x != parent_x:
+            dx = 1 if x > parent_x else -1
+            return [(0, -1), (0, 1), (dx, 0)]
+        dy = 1 if y > parent_y else -1
+        return [(-1, 0), (1, 0), (0, dy)]
+
+    # Expand the straight segments between consecutive jump points into a full path
+    def expandJumps(self, jumps):
+        path = jumps[:1]
+        for x, y in jumps[1:]:
+            prev_x, prev_y = path[-1]
+            dx, dy = (x > prev_x) - (x < prev_x), (y > prev_y) - (y < prev_y)
+            while (prev_x, prev_y) != (x, y):
+                prev_x, prev_y = prev_x + dx, prev_y + dy
+                path.append((prev_x, prev_y))
+        return path
+
+    def jpsPath(self):
+        cells = self.grid.cells
+        self.scan_cells = cells if isinstance(cells, (bytes, bytearray)) else bytes(cells)
+        # Initialize priority queue with start state, as in A*, but only jump points are pushed
+        pq = [(self.getMinHeuristic(self.start_id), 0, self.start_id)]  # (f_score, nodes_explored, cell)
+        g_scores = array('i', [-1]) * self.size
+        g_scores[self.start_id] = 0
+        self.parents = self.createParents()
+        self.parents[self.start_id] = self.start_id
+        self.visited_ids.append(self.start_id)
+        cols, jumps = self.grid.cols, self.jumps
+
+        while pq:
+            # Get jump point with lowest f_score, skipping entries already expanded with a better cost
+            f, _, current = heapq.heappop(pq)
+            if current in self.visited:
+                continue
+            self.visited.add(current)
+            self.nodes_explored += 1
+            self.markVisited(current)
+
+            # Check if current jump point is goal
+            if self.isGoal(current):
+                path = self.expandJumps(self.reconstructPath(current))
+                for x, y in path:
+                    self.markVisited(y * cols + x)
+                self.markFinalPath(path)
+                return True, path
+
+            # Jump in each remaining direction and queue the jump points found
+            for dx, dy in self.getJumpDirections(current):
+                next_index = jumps[dx, dy][current]
+                if next_index == -2:
+                    next_index = self.jump(current, dx, dy)
+                if next_index < 0 or next_index in self.visited:
+                    continue
+
+                new_g = g_scores[current] + abs(next_index - current) // abs(dx + dy * cols)
+                if g_scores[next_index] < 0 or new_g < g_scores[next_index]:
+                    if g_scores[next_index] < 0:
+                        self.visited_ids.append(next_index)
+                    g_scores[next_index] = new_g
+                    self.parents[next_index] = current
+                    heapq.heappush(pq, (new_g + self.getMinHeuristic(next_index), self.nodes_explored, next_index))
 
         # No path found
         return False, []
@@ -183,117 +420,274 @@ class AStarSearch(Search):
 class GreedyBestFirstSearch(Search):
     def gbfsPath(self):
         # Initialize priority queue with start state using heuristic
-        pq = [(self.getMinHeuristic(self.start), 0, self.start, [])]  # (heuristic, nodes_explored, position, path)
-        
-        self.visited.add(self.start)
-        self.visited_order.append(self.start)
+        # Ties on heuristic are broken by position (x, then y) after insertion order
+        start_x, start_y = self.start
+        pq = [(self.getMinHeuristic(self.start_id), 0, start_x, start_y, self.start_id)]  # (heuristic, nodes_explored, x, y, cell)
+        self.parents = self.createParents()
+        self.parents[self.start_id] = self.start_id
+
+        self.visited.add(self.start_id)
+        self.visited_ids.append(self.start_id)
+        cols = self.grid.cols
 
         while pq:
             # Get node with lowest heuristic value from queue
-            h, _, (x, y), path = heapq.heappop(pq)
-            
+            h, _, _, _, current = heapq.heappop(pq)
+
             self.nodes_explored += 1
-            self.markVisited(x, y)
+            self.markVisited(current)
 
             # Check if current node is goal
-            if self.isGoal((x, y)):
-                self.markFinalPath(path + [(x, y)])
-                return True, path + [(x, y)]
-
-            # Check all neighboring positions
-            for dx, dy in self.directions:
-                next_x, next_y = x + dx, y + dy
-                next_pos = (next_x, next_y)
-                
-                if self.isValidMove(next_x, next_y):
-                    # Calculate heuristic for neighbor
-                    h = self.getMinHeuristic(next_pos)
-                    
-                    self.visited.add(next_pos)
-                    self.visited_order.append(next_pos)
-                    
-                    heapq.heappush(pq, (h, self.nodes_explored, next_pos, path + [(x, y)]))
+            if self.isGoal(current):
+                path = self.reconstructPath(current)
+                self.markFinalPath(path)
+                return True, path
+
+            # Check all neighboring cells
+            for next_index in self.getNeighbors(current):
+                # Calculate heuristic for neighbor
+                h = self.getMinHeuristic(next_index)
+
+                self.visited.add(next_index)
+                self.visited_ids.append(next_index)
+                self.parents[next_index] = current
+
+                next_y, next_x = divmod(next_index, cols)
+                heapq.heappush(pq, (h, self.nodes_explored, next_x, next_y, next_index))
 
         # No path found
         return False, []
 
 
 # Custom Searches
-# Bidirectional BFS search 
+# Bidirectional BFS search
 class BidirectionalSearch(BreadthFirstSearch):
     def __init__(self, grid):
         # Initialize using parent BFS class constructor
         super().__init__(grid)
-        
+
     def bdsPath(self):
-        # Initialize queues and visited dictionaries for both directions
-        forward_queue = deque([(self.start, [])])  # Starts from beginning
-        backward_queue = deque([(next(iter(self.goals)), [])])  # Starts from goal
-        forward_visited = {self.start: [self.start]}  # Track forward paths
-        backward_visited = {next(iter(self.goals)): [next(iter(self.goals))]}  # Track backward paths
-        
-        self.visited_order = [self.start]
-        
+        # Initialize queues and predecessor arrays for both directions
+        goal = self.grid.index(*next(iter(self.goals)))
+        forward_queue = deque([self.start_id])  # Starts from beginning
+        backward_queue = deque([goal])  # Starts from goal
+        forward_parents = self.createParents()  # Track forward predecessors
+        forward_parents[self.start_id] = self.start_id
+        backward_parents = self.createParents()  # Track backward predecessors
+        backward_parents[goal] = goal
+
+        self.visited_ids = array('i', [self.start_id])
+
         while forward_queue and backward_queue:
             # Forward search from start
-            current_f, path_f = forward_queue.popleft()
+            current_f = forward_queue.popleft()
             self.nodes_explored += 1
-            self.markVisited(*current_f)
-            
+            self.markVisited(current_f)
+
             # Process neighbors in forward direction
-            for next_pos, new_path in self.getNeighbors(*current_f, path_f):
-                if next_pos not in forward_visited:
-                    # Update path and visited info
-                    current_path = path_f + [current_f]
-                    forward_visited[next_pos] = current_path + [next_pos]
-                    forward_queue.append((next_pos, current_path))
-                    self.visited_order.append(next_pos)
-                    
+            for next_index in self.getNeighbors(current_f):
+                if forward_parents[next_index] < 0:
+                    # Update predecessor and visited info
+                    forward_parents[next_index] = current_f
+                    forward_queue.append(next_index)
+                    self.visited_ids.append(next_index)
+
                 # Check if paths meet
-                if next_pos in backward_visited:
-                    intersection = next_pos
-                    # Mark intersection point with X
-                    self.grid.grid[intersection[1]][intersection[0]] = 'X'
-                    # Get forward path to intersection
-                    forward_path = forward_visited[next_pos]
-                    # Get backward path from intersection to goal and reverse it
-                    backward_path = backward_visited[next_pos][::-1]
-                    # Combine paths: forward_path + backward_path[1:] to avoid duplicate intersection
-                    complete_path = forward_path + backward_path[1:]
-                    self.markFinalPath(complete_path)
-                    return True, complete_path
-            
+                if backward_parents[next_index] >= 0:
+                    return self.joinPaths(next_index, forward_parents, backward_parents)
+
             # Backward search from goal
-            current_b, path_b = backward_queue.popleft()
+            current_b = backward_queue.popleft()
             self.nodes_explored += 1
-            self.markVisited(*current_b)
-            
+            self.markVisited(current_b)
+
             # Process neighbors in backward direction
-            for next_pos, new_path in self.getNeighbors(*current_b, path_b):
-                if next_pos not in backward_visited:
-                    # Update path and visited info
-                    current_path = path_b + [current_b]
-                    backward_visited[next_pos] = current_path + [next_pos]
-                    backward_queue.append((next_pos, current_path))
-                    self.visited_order.append(next_pos)
-                    
+            for next_index in self.getNeighbors(current_b):
+                if backward_parents[next_index] < 0:
+                    # Update predecessor and visited info
+                    backward_parents[next_index] = current_b
+                    backward_queue.append(next_index)
+                    self.visited_ids.append(next_index)
+
                 # Check if paths meet
-                if next_pos in forward_visited:
-                    intersection = next_pos
-                    # Mark intersection point with X
-                    self.grid.grid[intersection[1]][intersection[0]] = 'X'
-                    # Get forward path to intersection
-                    forward_path = forward_visited[next_pos]
-                    # Get backward path from intersection to goal and reverse it
-                    backward_path = backward_visited[next_pos][::-1]
-                    # Combine paths: forward_path + backward_path[1:] to avoid duplicate intersection
-                    complete_path = forward_path + backward_path[1:]
-                    self.markFinalPath(complete_path)
-                    return True, complete_path
-        
+                if forward_parents[next_index] >= 0:
+                    return self.joinPaths(next_index, forward_parents, backward_parents)
+
         # No path found
         return False, []
 
+    # Combine the forward and backward halves of the path at the intersection cell
+    def joinPaths(self, intersection, forward_parents, backward_parents):
+        # Mark intersection point with X
+        self.grid.setSymbolAt(intersection, 'X')
+        # Get forward path to intersection
+        forward_path = self.reconstructPath(intersection, forward_parents)
+        # Get backward path from intersection to goal (built goal-first, so reverse it)
+        backward_path = self.reconstructPath(intersection, backward_parents)[::-1]
+        # Combine paths: forward_path + backward_path[1:] to avoid duplicate intersection
+        complete_path = forward_path + backward_path[1:]
+        self.markFinalPath(complete_path)
+        return True, complete_path
+
+
+# Bidirectional search from the start and from every goal at once
+class MultiGoalBidirectionalSearch(BidirectionalSearch):
+    def mbdsPath(self):
+        # Searches forward from the start and backward from all goals together, a whole layer at a time,
+        # always growing the side with the smaller frontier. While both sides hold complete layers, every
+        # path between them crosses a cell at the edge of each, so the first cell reached from both sides
+        # lies on a shortest path to the nearest goal.
+        if self.start_id in self.goal_ids:
+            self.nodes_explored += 1
+            self.markVisited(self.start_id)
+            self.visited_ids = array('i', [self.start_id])
+            path = [self.start]
+            self.markFinalPath(path)
+            return True, path
+
+        # Initialize predecessor arrays; each goal is the root of the backward search
+        forward_parents = self.createParents()
+        forward_parents[self.start_id] = self.start_id
+        backward_parents = self.createParents()
+        for goal in self.goal_ids:
+            backward_parents[goal] = goal
+        forward_frontier = [self.start_id]
+        backward_frontier = sorted(self.goal_ids)
+
+        self.visited_ids = array('i', [self.start_id])
+        self.visited_ids.extend(backward_frontier)
+        cells, cols, size = self.grid.cells, self.grid.cols, self.size
+
+        while forward_frontier and backward_frontier:
+            # Grow the smaller frontier by one layer
+            forward = len(forward_frontier) <= len(backward_frontier)
+            if forward:
+                frontier, parents, other_parents = forward_frontier, forward_parents, backward_parents
+            else:
+                frontier, parents, other_parents = backward_frontier, backward_parents, forward_parents
+
+            next_frontier = []
+            for current in frontier:
+                self.nodes_explored += 1
+                self.markVisited(current)
+
+                # Neighbors in direction priority order: up, left, down, right
+                x = current % cols
+                for next_index in (current - cols, current - 1 if x > 0 else -1,
+                                   current + cols, current + 1 if x < cols - 1 else -1):
+                    if 0 <= next_index < size and not cells[next_index] and parents[next_index] < 0:
+                        parents[next_index] = current
+                        self.visited_ids.append(next_index)
+
+                        # Check if the searches meet
+                        if other_parents[next_index] >= 0:
+                            return self.joinPaths(next_index, forward_parents, backward_parents)
+                        next_frontier.append(next_index)
+
+            if forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        # No path found
+        return False, []
+
+
+# Bidirectional A* search from the start and from every goal at once
+class BidirectionalAStarSearch(BidirectionalSearch):
+    # Potential of a cell, doubled to stay an integer: the distance to the nearest goal minus the distance
+    # from the start. Each term changes by at most 1 between neighbors, so half of it is a consistent
+    # heuristic forward, and half of its negation a consistent heuristic backward.
+    def getPotential(self, index):
+        y, x = divmod(index, self.grid.cols)
+        start_x, start_y = self.start
+        return self.getMinHeuristic(index) - abs(x - start_x) - abs(y - start_y)
+
+    def bastarPath(self):
+        # Runs A* forward from the start and backward from all goals, growing the side with the smaller
+        # open list. Since the two heuristics add up to zero, a path through the open cells is never shorter
+        # than the sum of the two smallest keys, so the search stops once that reaches the best path found.
+        if self.start_id in self.goal_ids:
+            self.nodes_explored += 1
+            self.markVisited(self.start_id)
+            self.visited_ids = array('i', [self.start_id])
+            path = [self.start]
+            self.markFinalPath(path)
+            return True, path
+
+        # Initialize cost and predecessor arrays; each goal is the root of the backward search
+        forward_g = array('i', [-1]) * self.size  # Cost from the start, -1 if unreached
+        backward_g = array('i', [-1]) * self.size  # Cost to the nearest goal, -1 if unreached
+        forward_parents = self.createParents()
+        backward_parents = self.createParents()
+        forward_closed = BitSet(self.size)
+        backward_closed = BitSet(self.size)
+
+        forward_g[self.start_id] = 0
+        forward_parents[self.start_id] = self.start_id
+        forward_open = [(self.getPotential(self.start_id), 0, self.start_id)]  # (doubled f_score, -g_score, cell)
+        backward_open = []
+        for goal in sorted(self.goal_ids):
+            backward_g[goal] = 0
+            backward_parents[goal] = goal
+            backward_open.append((-self.getPotential(goal), 0, goal))
+        heapq.heapify(backward_open)
+
+        self.visited_ids = array('i', [self.start_id])
+        self.visited_ids.extend(sorted(self.goal_ids))
+        cells, cols, size = self.grid.cells, self.grid.cols, self.size
+        best_length, meeting = -1, -1  # Shortest path through both searches so far, and where they meet
+
+        while True:
+            # Drop closed cells and outdated entries from the top of both open lists
+            while forward_open and (forward_open[0][2] in forward_closed or
+                                    -forward_open[0][1] != forward_g[forward_open[0][2]]):
+                heapq.heappop(forward_open)
+            while backward_open and (backward_open[0][2] in backward_closed or
+                                     -backward_open[0][1] != backward_g[backward_open[0][2]]):
+                heapq.heappop(backward_open)
+            if not forward_open or not backward_open:
+                break
+            if meeting >= 0 and forward_open[0][0] + backward_open[0][0] >= 2 * best_length:
+                break
+
+            # Expand the best cell on the side with the smaller open list
+            if len(forward_open) <= len(backward_open):
+                open_list, g_scores, other_g, parents, closed, sign = (
+                    forward_open, forward_g, backward_g, forward_parents, forward_closed, 1)
+            else:
+                open_list, g_scores, other_g, parents, closed, sign = (
+                    backward_open, backward_g, forward_g, backward_parents, backward_closed, -1)
+            _, _, current = heapq.heappop(open_list)
+            closed.add(current)
+            self.nodes_explored += 1
+            self.markVisited(current)
+
+            # Neighbors in direction priority order: up, left, down, right
+            new_g = g_scores[current] + 1
+            x = current % cols
+            for next_index in (current - cols, current - 1 if x > 0 else -1,
+                               current + cols, current + 1 if x < cols - 1 else -1):
+                if not 0 <= next_index < size or cells[next_index] or next_index in closed:
+                    continue
+
+                # Update if new path is better
+                if g_scores[next_index] < 0 or new_g < g_scores[next_index]:
+                    if g_scores[next_index] < 0 and other_g[next_index] < 0:
+                        self.visited_ids.append(next_index)
+                    g_scores[next_index] = new_g
+                    parents[next_index] = current
+                    heapq.heappush(open_list, (2 * new_g + sign * self.getPotential(next_index), -new_g, next_index))
+
+                    # Check if the searches meet on a shorter path
+                    if other_g[next_index] >= 0 and (meeting < 0 or new_g + other_g[next_index] < best_length):
+                        best_length, meeting = new_g + other_g[next_index], next_index
+
+        if meeting < 0:
+            # No path found
+            return False, []
+        return self.joinPaths(meeting, forward_parents, backward_parents)
+
 
 # Beam search
 class BeamSearch(Search):
@@ -303,51 +697,55 @@ class BeamSearch(Search):
 
     def beamPath(self):
         # Initialize beam with start node
-        start_h = self.getMinHeuristic(self.start)
-        current_beam = [(start_h, 0, self.start, [])]  # (f_value, g_value, position, path)
-        self.visited.add(self.start)
-        self.visited_order.append(self.start)
+        start_h = self.getMinHeuristic(self.start_id)
+        current_beam = [(start_h, 0, self.start_id, self.start_id)]  # (f_value, g_value, cell, parent)
+        self.parents = self.createParents()
+        self.parents[self.start_id] = self.start_id
+        self.visited.add(self.start_id)
+        self.visited_ids.append(self.start_id)
 
         while current_beam:
             next_candidates = []
-            
+
             # Process current beam
-            for f_val, g_val, (x, y), path in current_beam:
+            for f_val, g_val, current, _ in current_beam:
                 self.nodes_explored += 1
-                self.markVisited(x, y)
-                
-                # Check if current position is goal
-                if self.isGoal((x, y)):
-                    self.markFinalPath(path + [(x, y)])
-                    return True, path + [(x, y)]
-
-                for next_pos, new_path in self.getNeighbors(x, y, path):
+                self.markVisited(current)
+
+                # Check if current cell is goal
+                if self.isGoal(current):
+                    path = self.reconstructPath(current)
+                    self.markFinalPath(path)
+                    return True, path
+
+                for next_index in self.getNeighbors(current):
                     # Calculate new costs
                     new_g = g_val + 1
-                    h_value = self.getMinHeuristic(next_pos)
+                    h_value = self.getMinHeuristic(next_index)
                     f_value = new_g + h_value * 1.1  # Slight weight on heuristic
-                    
-                    next_candidates.append((f_value, new_g, next_pos, new_path))
+
+                    next_candidates.append((f_value, new_g, next_index, current))
 
             if not next_candidates:
                 break
 
             # Remove duplicates and select top k candidates
             unique_candidates = []
-            seen_positions = set()
+            seen_cells = set()
             for candidate in next_candidates:
-                pos = candidate[2]
-                if pos not in seen_positions:
-                    seen_positions.add(pos)
+                cell = candidate[2]
+                if cell not in seen_cells:
+                    seen_cells.add(cell)
                     unique_candidates.append(candidate)
 
             # Sort by f_value, then g_value and select beam_width best candidates
             unique_candidates.sort(key=lambda x: (x[0], x[1]))
             current_beam = unique_candidates[:self.beam_width]
-            
-            # Mark selected candidates as visited
-            for _, _, pos, _ in current_beam:
-                self.visited.add(pos)
-                self.visited_order.append(pos)
+
+            # Mark selected candidates as visited and record how they were reached
+            for _, _, cell, parent in current_beam:
+                self.visited.add(cell)
+                self.visited_ids.append(cell)
+                self.parents[cell] = parent
 
         return False, []
\ No newline at end of file
@@ -0,0 +1,148 @@
+# Description: Persistent solver that keeps mazes in memory and answers JSON-lines requests.
+import json
+import os
+import socketserver
+import stat
+import threading
+from search import INCREMENTAL_METHODS, createSearch, loadMaze, solveQuery, validateBeamWidth
+
+# Requests, one JSON object per line (an optional "id" is echoed back in the response):
+#   {"op": "load", "maze": "m1", "file": "maze.txt"}
+#   {"op": "solve", "maze": "m1", "method": "astar", "start": [0, 1], "goals": [[7, 0]], "beam_width": 2}
+#   {"op": "walls", "maze": "m1", "add": [[3, 4]], "remove": [[5, 2]]}
+#   {"op": "unload", "maze": "m1"}
+#   {"op": "list"}
+# "start" and "goals" are optional and default to the ones in the maze file.
+# Incremental methods (lpa) keep one search per maze, which repairs its last plan after walls change.
+# Every response has "ok"; failed requests carry "error" instead of a result.
+
+
+class SolverServer:
+    def __init__(self):
+        self.mazes = {}  # Maze name -> (grid, start and goals from its file)
+        self.planners = {}  # (maze name, method) -> incremental search kept between solves
+        self.lock = threading.Lock()  # Searches mark the shared grids, so requests run one at a time
+
+    # Load a maze file and keep it resident under a name
+    def load(self, request):
+        filename = request['file']
+        name = request.get('maze', filename)
+        grid = loadMaze(filename)
+        self.mazes[name] = (grid, grid.start, grid.goals)
+        self.dropPlanners(name)
+        return {'maze': name, 'rows': grid.rows, 'cols': grid.cols}
+
+    # Solve one query on a resident maze
+    def solve(self, request):
+        name = request['maze']
+        if name not in self.mazes:
+            raise ValueError(f"Maze '{name}' is not loaded")
+        grid, default_start, default_goals = self.mazes[name]
+
+        start = tuple(request['start']) if 'start' in request else default_start
+        goals = [tuple(goal) for goal in request['goals']] if 'goals' in request else default_goals
+        method = request['method'].lower()
+        beam_width = validateBeamWidth(request.get('beam_width', 2))
+        search = None
+        if method in INCREMENTAL_METHODS:
+            if (name, method) not in self.planners:
+                self.planners[name, method] = createSearch(grid, method)
+            search = self.planners[name, method]
+        result = solveQuery(grid, method, start, goals, beam_width, search)
+        del result['error']
+        return result
+
+    # Add and remove walls on a resident maze, given as [x, y] cells
+    def walls(self, request):
+        name = request['maze']
+        if name not in self.mazes:
+            raise ValueError(f"Maze '{name}' is not loaded")
+        grid = self.mazes[name][0]
+
+        # Check every cell before changing any, so a rejected request leaves the maze as it was
+        changes = [(x, y, True) for x, y in self.getWallCells(request, 'add')]
+        changes += [(x, y, False) for x, y in self.getWallCells(request, 'remove')]
+        for x, y, _ in changes:
+            grid.checkWallPosition(x, y)
+        changed = 0
+        for x, y, wall in changes:
+            changed += grid.setWall(x, y, wall)
+        return {'maze': name, 'changed': changed}
+
+    # Read a list of [x, y] cells from a walls request
+    @staticmethod
+    def getWallCells(request, field):
+        cells = request.get(field, [])
+        if not isinstance(cells, list):
+            raise ValueError(f"'{field}' must be a list of [x, y] cells")
+        for cell in cells:
+            if not (isinstance(cell, list) and len(cell) == 2 and all(type(value) is int for value in cell)):
+                raise ValueError(f"Invalid cell {json.dumps(cell)} in '{field}': expected [x, y] with integer x and y")
+        return cells
+
+    # Drop a resident maze
+    def unload(self, request):
+        name = request['maze']
+        if self.mazes.pop(name, None) is None:
+            raise ValueError(f"Maze '{name}' is not loaded")
+        self.dropPlanners(name)
+        return {'maze': name}
+
+    # Drop the incremental searches kept for a maze
+    def dropPlanners(self, name):
+        for key in [key for key in self.planners if key[0] == name]:
+            del self.planners[key]
+
+    # List the resident mazes
+    def list(self, request):
+        return {'mazes': sorted(self.mazes)}
+
+    # Handle one request line and return the response line
+    def handleLine(self, line):
+        response = {'ok': True}
+        try:
+            request = json.loads(line)
+            if 'id' in request:
+                response['id'] = request['id']
+            handlers = {'load': self.load, 'solve': self.solve, 'walls': self.walls, 'unload': self.unload,
+                        'list': self.list}
+            op = request.get('op')
+            if op not in handlers:
+                raise ValueError(f"Unknown op '{op}'. Available ops: {', '.join(handlers)}")
+            with self.lock:
+                response.update(handlers[op](request))
+        except KeyError as e:
+            response.update(ok=False, error=f"Missing field {e}")
+        except Exception as e:
+            response.update(ok=False, error=str(e))
+        return json.dumps(response)
+
+    # Answer requests from a text stream until it closes
+    def serveStream(self, input_stream, output_stream):
+        for line in input_stream:
+            if line.strip():
+                output_stream.write(self.handleLine(line) + '\n')
+                output_stream.flush()
+
+    # Answer requests from clients connecting to a local Unix socket
+    def serveSocket(self, socket_path):
+        solver = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    line = line.decode('utf-8')
+                    if line.strip():
+                        self.wfile.write((solver.handleLine(line) + '\n').encode('utf-8'))
+                        self.wfile.flush()
+
+        # A socket left by an earlier server is replaced; anything else at the path is kept
+        if os.path.lexists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise ValueError(f"'{socket_path}' exists and is not a socket; refusing to replace it")
+            os.remove(socket_path)
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+            try:
+                server.serve_forever()
+            finally:
+                os.remove(socket_path)
\ No newline at end of file
@@ -2,34 +2,66 @@
 
 import os
 import time
+import signal
+import threading
 import psutil
 import pandas as pd
+from contextlib import contextmanager
+from multiprocessing import Pool, TimeoutError as PoolTimeoutError
 from statistics import mean
 from tabulate import tabulate
 from grid import Grid
 from fileRead import FileRead
 from testgenerator import TestGenerator
 
+# Per-run timeouts are enforced with SIGALRM inside the process running the test where available.
+# Elsewhere the parallel runner stops waiting for a run after the timeout instead, and the
+# worker stuck on it is only stopped when the pool is terminated at the end of the suite.
+SIGNAL_TIMEOUT = hasattr(signal, 'setitimer')
+
+# Test suite owned by each worker process of a parallel run
+worker_suite = None
+
+@contextmanager
+def timeLimit(timeout):
+    # Raise TimeoutError in the current process if the block runs longer than timeout seconds
+    if not timeout or not SIGNAL_TIMEOUT or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TimeoutError(f"Timed out after {timeout:g} s")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def initWorker():
+    # Create the test suite used by a worker process
+    global worker_suite
+    worker_suite = TestSuiteExtension()
+
+def runWorkerTest(test_file, method, timeout):
+    # Run one test in a worker process
+    return worker_suite.runSingleTest(test_file, method, timeout)
+
 class TestSuiteExtension:
-    def __init__(self):
+    def __init__(self, workers=1, timeout=None, seed=None):
         self.test_cases_dir = 'test_cases'
         self.results = {}
         self.summary = {}
-        self.generator = TestGenerator()
-        # Import search methods during initialization to avoid circular import
-        from searchstrat import (BreadthFirstSearch, DepthFirstSearch, 
-                                AStarSearch, GreedyBestFirstSearch, 
-                                BidirectionalSearch, BeamSearch)
-        
-        self.search_methods = {
-            'bfs': (BreadthFirstSearch, 'bfsPath', 'Breadth-First Search'),
-            'dfs': (DepthFirstSearch, 'dfsPath', 'Depth-First Search'),
-            'astar': (AStarSearch, 'astarPath', 'A* Search'),
-            'gbfs': (GreedyBestFirstSearch, 'gbfsPath', 'Greedy Best-First Search'),
-            'bds': (BidirectionalSearch, 'bdsPath', 'Bidirectional Search'),
-            'bs': (BeamSearch, 'beamPath', 'Beam Search')
-        }
-        
+        self.workers = workers  # Processes running tests; 1 runs them in this process
+        self.timeout = timeout  # Seconds allowed per (test file, method) run, or None for no limit
+        self.generator = TestGenerator(seed)  # A fixed seed regenerates the same test mazes
+        # Test every engine in the search registry, so engines added to it later are tested too.
+        # Imported during initialization to avoid a circular import.
+        from search import SEARCH_METHODS, loadEngine
+        self.search_methods = {method: loadEngine(method) + (info[3],) for method, info in SEARCH_METHODS.items()}
+
     def runTestSuite(self):
         # Execute the complete test suite
         print("\n" + "="*50)
@@ -67,6 +99,11 @@ class TestSuiteExtension:
         self.generator.generateAllTests()  # Using the new combined test generation method
         print("Test cases generated successfully.")
 
+        # The test mazes are stored as wall rectangles, so check the conversion loses no cells
+        checked, rectangles, bound = self.generator.checkWallConversion()
+        print(f"Wall conversion round trip matched on {checked} mazes, using {rectangles} rectangles "
+              f"({100.0 * (rectangles - bound) / bound:.1f}% above the lower bound of {bound}).")
+
     def runTests(self):
         # Run all tests for each search method
         # Initialize results
@@ -92,23 +129,54 @@ class TestSuiteExtension:
         total_tests = len(test_files) * len(self.search_methods)
         completed_tests = 0
 
-        for test_file in test_files:
-            test_number = test_file.replace('test', '').replace('.txt', '')
-            print(f"\nRunning Test {test_number}...")
-            
-            for method in self.search_methods.keys():
-                # Update progress
-                completed_tests += 1
-                progress = (completed_tests / total_tests) * 100
-                print(f"Progress: {progress:.1f}% - Running {method.upper()} on Test {test_number}")
-                
-                result = self.runSingleTest(test_file, method)
-                self.results[method].append(result)
-                self.updateSummary(method, result)
+        # With several workers, queue every run on a process pool up front.
+        # Results are still collected in file and method order, so the report does not depend on scheduling.
+        pool, pending = None, []
+        if self.workers > 1:
+            pool = Pool(self.workers, initializer=initWorker)
+            pending = [pool.apply_async(runWorkerTest, (test_file, method, self.timeout))
+                       for test_file in test_files for method in self.search_methods.keys()]
+
+        try:
+            for test_file in test_files:
+                test_number = test_file.replace('test', '').replace('.txt', '')
+                print(f"\nRunning Test {test_number}...")
+
+                for method in self.search_methods.keys():
+                    # Update progress
+                    completed_tests += 1
+                    progress = (completed_tests / total_tests) * 100
+                    print(f"Progress: {progress:.1f}% - Running {method.upper()} on Test {test_number}")
+
+                    if pool:
+                        result = self.collectResult(pending[completed_tests - 1], test_file, method)
+                    else:
+                        result = self.runSingleTest(test_file, method, self.timeout)
+                    self.results[method].append(result)
+                    self.updateSummary(method, result)
+        finally:
+            if pool:
+                pool.terminate()
+
+    def collectResult(self, pending_result, test_file, method):
+        # Wait for a run queued on the process pool and return its result
+        try:
+            if SIGNAL_TIMEOUT:
+                return pending_result.get()  # The worker enforces the timeout itself
+            return pending_result.get(timeout=self.timeout)
+        except PoolTimeoutError:
+            error = f"Timed out after {self.timeout:g} s"
+        except Exception as e:
+            error = str(e)
+
+        result = self.createResult(test_file, method)
+        result['status'] = 'FAILED'
+        result['error'] = error
+        return result
 
-    def runSingleTest(self, test_file, method):
-        # Run a single test and return results
-        result = {
+    def createResult(self, test_file, method):
+        # Create the result record for a run that has not produced any measurements yet
+        return {
             'test_name': test_file,
             'method': method,
             'status': 'PASSED',
@@ -119,51 +187,63 @@ class TestSuiteExtension:
             'memory_mb': 0
         }
 
-        try:
-            # Get initial memory usage
-            process = psutil.Process(os.getpid())
-            memory_start = process.memory_info().rss / 1024  # Convert to KB
-            
-            # Capture start time
-            start_time = time.perf_counter()
-            
-            # Read and parse test file
-            lines = FileRead.readFile(os.path.join(self.test_cases_dir, test_file))
-            config = FileRead.parseGridInfo(lines)
-            
-            # Create grid and run search
-            grid = Grid(config['dimensions'], config['start'], config['goals'], config['walls'])
-            search_class = self.search_methods[method][0]
-            search_method = self.search_methods[method][1]
-            
-            # Initialize search (special case for beam search)
-            if method == 'bs':
-                search = search_class(grid, beam_width=2)
-            else:
-                search = search_class(grid)
-            
-            # Execute search
-            found, path = getattr(search, search_method)()
-            
-            # Record results
-            result['time_ms'] = (time.perf_counter() - start_time) * 1000
-            result['nodes_explored'] = search.nodes_explored
-            result['path_length'] = len(path) if found else 0
-            
-            # Calculate memory usage
-            memory_end = process.memory_info().rss / 1024  # Convert to KB
-            result['memory_mb'] = memory_end - memory_start
-
-            if not found and any(goal in search.goals for goal in config['goals']):
-                result['status'] = 'FAILED'
-                result['error'] = 'No path found to valid goal'
+    def runSingleTest(self, test_file, method, timeout=None):
+        # Run a single test and return results, failing it if it runs longer than timeout seconds
+        result = self.createResult(test_file, method)
 
+        try:
+            with timeLimit(timeout):
+                self.measureTest(test_file, method, result)
         except Exception as e:
             result['status'] = 'FAILED'
             result['error'] = str(e)
 
         return result
 
+    def measureTest(self, test_file, method, result):
+        # Load the test file, run the search and record its measurements in result
+        # Get initial memory usage
+        process = psutil.Process(os.getpid())
+        memory_start = process.memory_info().rss / 1024  # Convert to KB
+        
+        # Capture start time
+        start_time = time.perf_counter()
+        
+        # Read and parse test file
+        lines = FileRead.readFile(os.path.join(self.test_cases_dir, test_file))
+        config = FileRead.parseGridInfo(lines)
+        
+        # Create grid and run search
+        grid = Grid(config['dimensions'], config['start'], config['goals'], config['walls'])
+        search_class = self.search_methods[method][0]
+        search_method = self.search_methods[method][1]
+        
+        # Initialize search (special case for beam search, and an in-memory cache for engines that keep one,
+        # so generated test mazes leave no cache files behind)
+        from search import ENGINE_CACHES, createMemoryCache
+        if method == 'bs':
+            search = search_class(grid, beam_width=2)
+        elif method in ENGINE_CACHES:
+            search = search_class(grid, cache=createMemoryCache(method))
+        else:
+            search = search_class(grid)
+        
+        # Execute search
+        found, path = getattr(search, search_method)()
+        
+        # Record results
+        result['time_ms'] = (time.perf_counter() - start_time) * 1000
+        result['nodes_explored'] = search.nodes_explored
+        result['path_length'] = len(path) if found else 0
+        
+        # Calculate memory usage
+        memory_end = process.memory_info().rss / 1024  # Convert to KB
+        result['memory_mb'] = memory_end - memory_start
+
+        if not found and any(goal in search.goals for goal in config['goals']):
+            result['status'] = 'FAILED'
+            result['error'] = 'No path found to valid goal'
+
     def updateSummary(self, method, result):
         # Update summary statistics for a method
         self.summary[method]['total_tests'] += 1
@@ -1,12 +1,15 @@
 import random
 import os
+from array import array
 from collections import deque
 from grid import Grid
 from fileRead import FileRead
 
 class TestGenerator:
-    def __init__(self):
+    def __init__(self, seed=None):
         self.test_cases_dir = 'test_cases'
+        # Random number generator for all generated mazes; the same seed reproduces the same mazes
+        self.random = random.Random(seed)
         if not os.path.exists(self.test_cases_dir):
             os.makedirs(self.test_cases_dir)
 
@@ -17,45 +20,75 @@ class TestGenerator:
             f.write(content)
         return filepath
 
+    def formatMaze(self, rows, cols, start, goal, walls):
+        # Format a maze in the text configuration format
+        return (f"[{rows},{cols}]\n"
+                f"[{start[0]},{start[1]}]\n"
+                f"[{goal[0]},{goal[1]}]\n" + 
+                '\n'.join(f"[{w[0]},{w[1]},{w[2]},{w[3]}]" for w in walls))
+
+    def writeMaze(self, filename, rows, cols, difficulty='medium'):
+        # Generate a random maze and write it to a file, in the binary format if the name ends in .bin
+        cells, start, goal = self.generateMazeCells(rows, cols, difficulty)
+        if filename.endswith('.bin'):
+            FileRead.writeBinary(Grid((rows, cols), start, [goal], [], cells=cells), filename)
+        else:
+            with open(filename, 'w') as f:
+                f.write(self.formatMaze(rows, cols, start, goal, self._convertToWalls(cells, rows, cols)))
+
+    def writeStreamingMaze(self, filename, rows, cols):
+        # Generate a perfect maze row by row and write it to a file, in the binary format if the name ends in .bin.
+        # Only the current row is held in memory, so the maze can be far larger than memory. Every room is
+        # connected, so the goal in the far corner can always be reached from the start.
+        start = (0, 0)
+        goal = ((cols - 1) // 2 * 2, (rows - 1) // 2 * 2)
+        binary = filename.endswith('.bin')
+        with open(filename, 'wb' if binary else 'w') as f:
+            if binary:
+                FileRead.writeBinaryHeader(f, rows, cols, start, [goal])
+            else:
+                f.write(f"[{rows},{cols}]\n[{start[0]},{start[1]}]\n[{goal[0]},{goal[1]}]\n")
+            for y, row in enumerate(self._generateEllerRows(rows, cols)):
+                f.write(row if binary else self._formatWallRow(row, y))
+
     def generateRandomMaze(self, rows, cols, difficulty='medium'):
-        # Generate a random maze with guaranteed path using recursive backtracking
+        # Generate a random maze with guaranteed path as wall rectangles
+        cells, start, goal = self.generateMazeCells(rows, cols, difficulty)
+        return start, goal, self._convertToWalls(cells, rows, cols)
+
+    def generateMazeCells(self, rows, cols, difficulty='medium'):
+        # Generate a random maze with guaranteed path using recursive backtracking.
+        # The maze is a row-major buffer of cells, 1 for walls, returned with its start and goal.
         max_attempts = 10
         for attempt in range(max_attempts):
             # Initialize grid with all walls
-            grid = [[1 for _ in range(cols)] for _ in range(rows)]
+            cells = bytearray(b'\x01') * (rows * cols)
             
             # Set start position
             start = (0, 0)
-            grid[0][0] = 0
 
-            # Generate the main maze structure
-            self._generateMazePaths(grid, 0, 0)
+            # Generate the main maze structure, finding the cell farthest from the start
+            goal, distance = self._generateMazePaths(cells, rows, cols)
             
-            # Find a valid distant goal and verify path exists
+            # Check that the goal is distant enough
             min_distance = self._getMinRequiredDistance(rows, cols, difficulty)
-            goal = self._findValidDistantGoal(grid, start, min_distance)
-            
-            if not goal:
+            if distance < min_distance:
                 continue  # Try again if no valid goal found
 
             # Add random walls based on difficulty while maintaining path
             if difficulty == 'medium':
-                self._addRandomWalls(grid, start, goal, density=0.15)
+                self._addRandomWalls(cells, rows, cols, start, goal, density=0.15)
             elif difficulty == 'hard':
-                self._addRandomWalls(grid, start, goal, density=0.25)
+                self._addRandomWalls(cells, rows, cols, start, goal, density=0.25)
             elif difficulty == 'extreme':
-                self._addRandomWalls(grid, start, goal, density=0.35)
+                self._addRandomWalls(cells, rows, cols, start, goal, density=0.35)
                 # For extreme difficulty, might block the path
-                if random.random() < 0.3:  # 30% chance to make it potentially unsolvable
-                    self._addRandomWalls(grid, start, goal, density=0.2, maintain_path=False)
-
-            # Verify path exists (except for extreme difficulty)
-            if difficulty != 'extreme' and not self._pathExists(grid, start, goal):
-                continue
+                if self.random.random() < 0.3:  # 30% chance to make it potentially unsolvable
+                    self._addRandomWalls(cells, rows, cols, start, goal, density=0.2, maintain_path=False)
 
-            # Convert grid to wall format
-            walls = self._convertToWalls(grid)
-            return start, goal, walls
+            # No need to verify the path: the carved maze connects every carved cell,
+            # and walls are only added while a path remains (except for extreme difficulty)
+            return cells, start, goal
 
         # If all attempts fail, create a simple maze with guaranteed path
         return self._createSimpleMaze(rows, cols, difficulty)
@@ -64,123 +97,137 @@ class TestGenerator:
         # Calculate minimum required distance based on maze size and difficulty
         base_distance = (rows + cols) // 4  # Base minimum distance
         
-        if difficulty == 'medium':
+        if difficulty in ('easy', 'medium'):
             return base_distance
         elif difficulty == 'hard':
             return base_distance * 1.5
         else:  # extreme
             return base_distance * 2
 
-    def _generateMazePaths(self, grid, x, y):
-        # Generate maze paths using recursive backtracking
-        rows, cols = len(grid), len(grid[0])
-        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            new_x, new_y = x + dx, y + dy
-            if (0 <= new_x < cols and 0 <= new_y < rows and 
-                grid[new_y][new_x] == 1):
-                
-                # Clear path cells
-                grid[new_y][new_x] = 0
-                grid[y + dy//2][x + dx//2] = 0
-                
-                self._generateMazePaths(grid, new_x, new_y)
-
-    def _findValidDistantGoal(self, grid, start, min_distance):
-        # Find a valid goal point that's sufficiently far from start
-        rows, cols = len(grid), len(grid[0])
-        distances = {}
-        queue = deque([(start, 0)])
-        distances[start] = 0
-        valid_goals = []
-
-        while queue:
-            pos, dist = queue.popleft()
-            x, y = pos
-
-            # If point is far enough, consider it as potential goal
-            if dist >= min_distance:
-                valid_goals.append((pos, dist))
-
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_x, new_y = x + dx, y + dy
-                new_pos = (new_x, new_y)
-                
-                if (0 <= new_x < cols and 0 <= new_y < rows and 
-                    grid[new_y][new_x] == 0 and 
-                    new_pos not in distances):
-                    
-                    distances[new_pos] = dist + 1
-                    queue.append((new_pos, dist + 1))
-
-        # Sort valid goals by distance and prefer corners/edges
-        if valid_goals:
-            valid_goals.sort(key=lambda x: (
-                -x[1],  # Prefer more distant points
-                -(x[0][0] == 0 or x[0][0] == cols-1),  # Prefer edges
-                -(x[0][1] == 0 or x[0][1] == rows-1)   # Prefer edges
-            ))
-            return valid_goals[0][0]
-        return None
+    def _generateMazePaths(self, cells, rows, cols):
+        # Generate maze paths from the top-left corner using recursive backtracking.
+        # Runs on an explicit stack, so large mazes do not hit the recursion limit, and keeps walking
+        # forward from each new cell; only cells that still have unvisited neighbors are stacked.
+        # The walk moves between nodes (the cells at even coordinates), tracked in a bytearray padded
+        # with a visited border, so each step reads its neighbors without bounds checks.
+        # The maze is a tree, so the depth a cell is carved at gives its distance from the start.
+        # Returns the farthest carved cell (preferring cells on the edges) and its distance.
+        rand = self.random.random
+        width = (cols + 1) // 2 + 2  # Nodes per padded row
+        unvisited = (bytearray(width) + (b'\x00' + b'\x01' * (width - 2) + b'\x00') * ((rows + 1) // 2) +
+                     bytearray(width))
+        # For each mask of unvisited neighbors (bit 0 down, 1 right, 2 up, 3 left), the moves it allows
+        # in that order, as (node step, half a step in cells), and how many there are
+        steps = ((width, cols), (1, 1), (-width, -cols), (-1, -1))
+        choices = []
+        for mask in range(16):
+            options = tuple(steps[direction] for direction in range(4) if mask >> direction & 1)
+            choices.append((options, len(options)))
+
+        node = width + 1
+        unvisited[node] = 0
+        cells[0] = 0
+        best, best_depth, best_edges = 0, 0, (True, True)
+        stack = []  # (node, cell, depth) to return to
+        push, pop = stack.append, stack.pop
+        current, depth = 0, 0
+        while True:
+            options, count = choices[unvisited[node + width] | unvisited[node + 1] << 1 |
+                                     unvisited[node - width] << 2 | unvisited[node - 1] << 3]
+            if not count:
+                if not stack:
+                    break
+                node, current, depth = pop()
+                continue
 
-    def _addRandomWalls(self, grid, start, goal, density, maintain_path=True):
-        # Add random walls while optionally maintaining path
-        rows, cols = len(grid), len(grid[0])
+            if count > 1:
+                push((node, current, depth))
+                node_step, half = options[int(rand() * count)]
+            else:
+                node_step, half = options[0]
+
+            # Clear path cells
+            node += node_step
+            unvisited[node] = 0
+            cells[current + half] = 0
+            current += half + half
+            cells[current] = 0
+            depth += 1
+
+            if depth >= best_depth:
+                y, x = divmod(current, cols)
+                edges = (x == 0 or x == cols - 1, y == 0 or y == rows - 1)
+                if depth > best_depth or edges > best_edges:
+                    best, best_depth, best_edges = current, depth, edges
+
+        # Each step carves two cells
+        y, x = divmod(best, cols)
+        return (x, y), 2 * best_depth
+
+    def _addRandomWalls(self, cells, rows, cols, start, goal, density, maintain_path=True):
+        # Add random walls while optionally maintaining path.
+        # The path is maintained by finding a solution corridor once and never walling it, rather than
+        # searching the whole maze after every wall. In a carved maze the path between two cells is
+        # unique, so this accepts exactly the walls a search after each wall would.
         num_walls = int(rows * cols * density)
         added_walls = 0
         max_attempts = num_walls * 3
 
+        corridor = self._findCorridor(cells, rows, cols, start, goal) if maintain_path else None
+        if maintain_path and corridor is None:
+            return  # No path to maintain, so every wall would be rejected
+
         for _ in range(max_attempts):
             if added_walls >= num_walls:
                 break
 
-            x = random.randint(1, cols-2)
-            y = random.randint(1, rows-2)
+            x = self.random.randint(1, cols-2)
+            y = self.random.randint(1, rows-2)
             
             # Don't block start or goal
             if (x, y) in [start, goal]:
                 continue
 
-            # Save current state
-            original_value = grid[y][x]
-            if grid[y][x] == 0:
-                grid[y][x] = 1
-                
-                # If we need to maintain path and it's broken, revert
-                if maintain_path and not self._pathExists(grid, start, goal):
-                    grid[y][x] = original_value
-                else:
-                    added_walls += 1
-
-    def _pathExists(self, grid, start, goal):
-        # Check if a path exists between start and goal
-        rows, cols = len(grid), len(grid[0])
-        visited = set()
-        queue = deque([start])
-        visited.add(start)
+            # Only open cells become walls, and never the cells of the maintained path
+            index = y * cols + x
+            if cells[index] == 0 and not (corridor and corridor[index]):
+                cells[index] = 1
+                added_walls += 1
+
+    def _findCorridor(self, cells, rows, cols, start, goal):
+        # Find a shortest path between start and goal with one breadth-first search.
+        # Returns a buffer marking the path's cells with 1, or None if there is no path.
+        size = rows * cols
+        parents = array('i', [-1]) * size
+        first = start[1] * cols + start[0]
+        target = goal[1] * cols + goal[0]
+        queue = deque([first])
+        parents[first] = first
 
         while queue:
-            x, y = queue.popleft()
-            if (x, y) == goal:
-                return True
-
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_x, new_y = x + dx, y + dy
-                new_pos = (new_x, new_y)
-                
-                if (0 <= new_x < cols and 0 <= new_y < rows and 
-                    grid[new_y][new_x] == 0 and 
-                    new_pos not in visited):
-                    visited.add(new_pos)
-                    queue.append(new_pos)
-
-        return False
+            current = queue.popleft()
+            if current == target:
+                corridor = bytearray(size)
+                corridor[current] = 1
+                while current != first:
+                    current = parents[current]
+                    corridor[current] = 1
+                return corridor
+
+            x = current % cols
+            for next_index in (current + cols, current + 1 if x < cols - 1 else -1,
+                               current - cols, current - 1 if x > 0 else -1):
+                if (0 <= next_index < size and 
+                    cells[next_index] == 0 and 
+                    parents[next_index] < 0):
+                    parents[next_index] = current
+                    queue.append(next_index)
+
+        return None
 
     def _createSimpleMaze(self, rows, cols, difficulty):
         # Create a simple maze with guaranteed path as fallback
-        grid = [[0 for _ in range(cols)] for _ in range(rows)]
+        cells = bytearray(rows * cols)
         start = (0, 0)
         goal = (cols-1, rows-1)
 
@@ -192,45 +239,191 @@ class TestGenerator:
         else:  # extreme
             wall_density = 0.3
 
-        self._addRandomWalls(grid, start, goal, wall_density, maintain_path=True)
-        walls = self._convertToWalls(grid)
-        return start, goal, walls
+        self._addRandomWalls(cells, rows, cols, start, goal, wall_density, maintain_path=True)
+        return cells, start, goal
+
+    def _generateEllerRows(self, rows, cols):
+        # Generate the rows of a perfect maze with Eller's algorithm, yielding one row of cells (1 for walls) at a time.
+        # Rooms sit on even coordinates, as in the carved mazes. Each room belongs to a set of rooms already
+        # connected through earlier rows: neighboring rooms of different sets are randomly joined, then every
+        # set continues down at least once, and the last row joins all remaining sets.
+        rand = self.random.random
+        width = (cols + 1) // 2  # Rooms per row
+        room_rows = (rows + 1) // 2
+        sets = [-1] * width  # Set of each room in the current row, -1 for a room not yet in one
+        parents = []  # Union-find over the sets of the current row
+
+        def find(label):
+            while parents[label] != label:
+                parents[label] = parents[parents[label]]
+                label = parents[label]
+            return label
+
+        for room_row in range(room_rows):
+            last_row = room_row == room_rows - 1
+
+            # Give rooms without a set a new one; sets are numbered below width
+            next_set = max(sets) + 1
+            for c in range(width):
+                if sets[c] < 0:
+                    sets[c] = next_set
+                    next_set += 1
+            parents = list(range(width))
+
+            # Join neighboring rooms of different sets, always in the last row
+            row = bytearray(b'\x01') * cols
+            row[0::2] = bytes(width)
+            for c in range(width - 1):
+                a, b = find(sets[c]), find(sets[c + 1])
+                if a != b and (last_row or rand() < 0.5):
+                    parents[b] = a
+                    row[2 * c + 1] = 0
+            yield row
+
+            if last_row:
+                if rows % 2 == 0:
+                    yield bytearray(b'\x01') * cols
+                break
 
-    def _convertToWalls(self, grid):
-        # Convert grid representation to wall list representation
-        rows, cols = len(grid), len(grid[0])
+            # Continue each set down from random rooms, and from its last room if none was picked before
+            roots = [find(label) for label in sets]
+            last_room = [0] * width
+            for c, root in enumerate(roots):
+                last_room[root] = c
+            continued = bytearray(width)
+            labels = [-1] * width  # Renumbers the continued sets from 0
+            next_set = 0
+            row = bytearray(b'\x01') * cols
+            for c, root in enumerate(roots):
+                if rand() < 0.5 or (last_room[root] == c and not continued[root]):
+                    continued[root] = 1
+                    if labels[root] < 0:
+                        labels[root] = next_set
+                        next_set += 1
+                    sets[c] = labels[root]
+                    row[2 * c] = 0
+                else:
+                    sets[c] = -1
+            yield row
+
+    def _formatWallRow(self, row, y):
+        # Format the walls of one row of cells as one-row wall rectangles in the text configuration format
+        lines = []
+        x = row.find(1)
+        while x >= 0:
+            end = row.find(0, x)
+            if end < 0:
+                end = len(row)
+            lines.append(f"[{x},{y},{end - x},1]\n")
+            x = row.find(1, end)
+        return ''.join(lines)
+
+    def _convertToWalls(self, cells, rows, cols):
+        # Convert grid representation to wall list representation.
+        # From each wall cell not yet covered, in row order, a rectangle takes the whole run of walls to the
+        # right (even over covered cells) and extends down while the row below is all walls. The runs are
+        # found with buffer searches rather than cell by cell, so the time is linear in the covered area.
         walls = []
-        visited = set()
+        visited = bytearray(rows * cols)
+        size = rows * cols
 
         for y in range(rows):
-            for x in range(cols):
-                if grid[y][x] == 1 and (x, y) not in visited:
-                    # Find connected wall region
-                    width = 1
-                    height = 1
-                    
-                    # Extend width
-                    while (x + width < cols and 
-                            grid[y][x + width] == 1 and 
-                            all(grid[y + h][x + width] == 1 
-                                for h in range(height))):
-                        width += 1
-                    
-                    # Extend height
-                    while (y + height < rows and 
-                            all(grid[y + height][x + w] == 1 
-                                for w in range(width))):
-                        height += 1
-
-                    # Mark all cells in this wall as visited
-                    for h in range(height):
-                        for w in range(width):
-                            visited.add((x + w, y + h))
-
-                    walls.append([x, y, width, height])
+            row_start = y * cols
+            row_end = row_start + cols
+            index = cells.find(1, row_start, row_end)
+            while index >= 0:
+                # Skip walls already covered by a rectangle from a row above
+                if visited[index]:
+                    index = visited.find(0, index, row_end)
+                    if index < 0:
+                        break
+                    index = cells.find(1, index, row_end)
+                    continue
+
+                # Extend width to the end of the run
+                run_end = cells.find(0, index, row_end)
+                width = (row_end if run_end < 0 else run_end) - index
+
+                # Extend height while the whole width is walls
+                below = index + cols
+                while below < size and cells.find(0, below, below + width) < 0:
+                    below += cols
+
+                # Mark all cells in this wall as visited
+                fill = b'\x01' * width
+                for covered in range(index, below, cols):
+                    visited[covered:covered + width] = fill
+
+                walls.append([index - row_start, y, width, (below - index) // cols])
+                index = cells.find(1, index + width, row_end)
 
         return walls
 
+    def _countWallCoverBound(self, cells, rows, cols):
+        # Lower bound on the number of rectangles any exact cover of the walls needs: the size of a set of
+        # wall cells no two of which fit together in one all-wall rectangle, chosen greedily starting from
+        # the cells with the shortest runs. Quadratic in the run lengths, so meant for test-sized mazes.
+
+        # Open cells above and to the left of each corner, to test a rectangle for openings in constant time
+        open_counts = [[0] * (cols + 1) for _ in range(rows + 1)]
+        for y in range(rows):
+            count = 0
+            for x in range(cols):
+                count += not cells[y * cols + x]
+                open_counts[y + 1][x + 1] = open_counts[y][x + 1] + count
+
+        def isAllWalls(x1, y1, x2, y2):
+            left, right, top, bottom = min(x1, x2), max(x1, x2) + 1, min(y1, y2), max(y1, y2) + 1
+            return (open_counts[bottom][right] - open_counts[top][right] -
+                    open_counts[bottom][left] + open_counts[top][left]) == 0
+
+        # Horizontal and vertical runs through each wall cell, as (left, right, top, bottom)
+        runs = {}
+        for index in range(rows * cols):
+            if cells[index]:
+                y, x = divmod(index, cols)
+                left, right, top, bottom = x, x, y, y
+                while left > 0 and cells[index - (x - left) - 1]:
+                    left -= 1
+                while right < cols - 1 and cells[index + (right - x) + 1]:
+                    right += 1
+                while top > 0 and cells[(top - 1) * cols + x]:
+                    top -= 1
+                while bottom < rows - 1 and cells[(bottom + 1) * cols + x]:
+                    bottom += 1
+                runs[x, y] = (left, right, top, bottom)
+
+        # Any cell sharing a rectangle with (x, y) lies within its runs' bounds
+        def runLength(cell):
+            left, right, top, bottom = runs[cell]
+            return right - left + bottom - top
+
+        chosen = set()
+        for x, y in sorted(runs, key=runLength):
+            left, right, top, bottom = runs[x, y]
+            if not any((other_x, other_y) in chosen and isAllWalls(x, y, other_x, other_y)
+                       for other_y in range(top, bottom + 1) for other_x in range(left, right + 1)):
+                chosen.add((x, y))
+        return len(chosen)
+
+    def checkWallConversion(self, sizes=((15, 15), (30, 30), (41, 57)), difficulties=('easy', 'medium', 'hard', 'extreme')):
+        # Check that converting generated mazes to wall rectangles and back gives the same cells,
+        # and measure how many rectangles the conversion uses against a lower bound for each maze.
+        # Raises ValueError on the first maze that differs, otherwise returns the number of mazes checked,
+        # the total rectangles and the total lower bound.
+        checked = rectangles = bound = 0
+        for rows, cols in sizes:
+            for difficulty in difficulties:
+                cells, start, goal = self.generateMazeCells(rows, cols, difficulty)
+                walls = self._convertToWalls(cells, rows, cols)
+                grid = Grid((rows, cols), start, [goal], walls)
+                if grid.cells != cells:
+                    raise ValueError(f"Wall conversion changed a {rows}x{cols} {difficulty} maze")
+                checked += 1
+                rectangles += len(walls)
+                bound += self._countWallCoverBound(cells, rows, cols)
+        return checked, rectangles, bound
+
     def generateHardcodedTests(self):
         # Generate the original 5 hardcoded test cases
         test_files = {
@@ -262,11 +455,7 @@ class TestGenerator:
 
         for filename, rows, cols, difficulty in random_configs:
             start, goal, walls = self.generateRandomMaze(rows, cols, difficulty)
-            content = (f"[{rows},{cols}]\n"
-                        f"[{start[0]},{start[1]}]\n"
-                        f"[{goal[0]},{goal[1]}]\n" + 
-                        '\n'.join(f"[{w[0]},{w[1]},{w[2]},{w[3]}]" for w in walls))
-            self.createTestFile(filename, content)
+            self.createTestFile(filename, self.formatMaze(rows, cols, start, goal, walls))
 
         # Generate tests 13-14 (extreme difficulty)
         extreme_configs = [
@@ -276,11 +465,7 @@ class TestGenerator:
 
         for filename, rows, cols, difficulty in extreme_configs:
             start, goal, walls = self.generateRandomMaze(rows, cols, difficulty)
-            content = (f"[{rows},{cols}]\n"
-                        f"[{start[0]},{start[1]}]\n"
-                        f"[{goal[0]},{goal[1]}]\n" + 
-                        '\n'.join(f"[{w[0]},{w[1]},{w[2]},{w[3]}]" for w in walls))
-            self.createTestFile(filename, content)
+            self.createTestFile(filename, self.formatMaze(rows, cols, start, goal, walls))
 
     def runTestSuite(self):
         # Generate and run all test cases
@@ -0,0 +1,106 @@
+# Description: Breadth-first search that expands a whole frontier layer at a time using NumPy array shifts.
+from array import array
+from grid import MARK_SYMBOLS
+from searchstrat import Search
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this engine needs it
+    np = None
+
+
+# Wavefront breadth-first search for large, mostly open grids
+class WavefrontSearch(Search):
+    def wavefrontPath(self):
+        if np is None:
+            raise ImportError("Wavefront search requires NumPy (pip install numpy)")
+
+        open_cells = np.frombuffer(self.grid.cells, dtype=np.uint8) == 0
+        goal_cells = np.zeros(self.size, dtype=bool)
+        goal_cells[list(self.goal_ids)] = True
+
+        # Distance in moves from the start, -1 for cells not reached yet
+        self.distances = np.full(self.size, -1, dtype=np.int32)
+        self.distances[self.start_id] = 0
+
+        # Expand layer by layer until a layer contains a goal
+        layers = self.expandLayers(open_cells, goal_cells)
+        self.visited_ids = array('i', np.concatenate(layers).astype(np.int32).tobytes())
+        depth = len(layers) - 1
+        final_goals = layers[-1][goal_cells[layers[-1]]]
+        if not len(final_goals):
+            self.markExplored(self.distances >= 0)
+            return False, []
+
+        # Every expanded layer, plus the goal itself, counts as explored
+        self.markExplored((self.distances >= 0) & (self.distances < depth))
+        self.nodes_explored += 1
+
+        path = self.tracePath(final_goals, depth)
+        self.markFinalPath(path)
+        return True, path
+
+    # Run the wavefront from the start, returning the cells of each layer in row-major order.
+    # Stops after the first layer holding a goal, or after the last reachable layer.
+    def expandLayers(self, open_cells, goal_cells):
+        frontier = np.array([self.start_id], dtype=np.int64)
+        unreached = open_cells.copy()
+        unreached[frontier] = False
+        layers = [frontier]
+
+        while not goal_cells[frontier].any():
+            reached = self.shiftCells(frontier)
+            reached = np.unique(reached[unreached[reached]])
+            if not len(reached):
+                break
+            unreached[reached] = False
+            self.distances[reached] = len(layers)
+            layers.append(reached)
+            frontier = reached
+
+        return layers
+
+    # Rebuild the path queue-based BFS would return to the goals in the final layer.
+    # BFS reaches each cell along its lexicographically smallest shortest sequence of
+    # moves in direction priority order, so walk backwards to find the cells that lie
+    # on a shortest path to one of these goals, then follow them forwards greedily.
+    def tracePath(self, final_goals, depth):
+        on_path = np.zeros(self.size, dtype=bool)
+        on_path[final_goals] = True
+        layer = final_goals
+
+        for d in range(depth - 1, -1, -1):
+            previous = self.shiftCells(layer)
+            layer = np.unique(previous[self.distances[previous] == d])
+            on_path[layer] = True
+
+        cols, rows = self.grid.cols, self.grid.rows
+        x, y = self.start
+        path = [(x, y)]
+        for d in range(1, depth + 1):
+            for dx, dy in self.directions:
+                next_x, next_y = x + dx, y + dy
+                next_index = next_y * cols + next_x
+                if (0 <= next_x < cols and 0 <= next_y < rows and
+                    on_path[next_index] and self.distances[next_index] == d):
+                    x, y = next_x, next_y
+                    break
+            path.append((x, y))
+        return path
+
+    # Shift a set of cells one step in each direction, dropping moves off the grid edges
+    def shiftCells(self, cells):
+        cols = self.grid.cols
+        x = cells % cols
+        return np.concatenate((
+            cells[cells >= cols] - cols,              # up
+            cells[x > 0] - 1,                         # left
+            cells[cells < self.size - cols] + cols,   # down
+            cells[x < cols - 1] + 1                   # right
+        ))
+
+    # Count explored cells and mark them visited on the grid
+    def markExplored(self, explored):
+        self.nodes_explored = int(np.count_nonzero(explored))
+        marks = np.frombuffer(self.grid.marks, dtype=np.uint8)
+        marks[explored & (marks == 0)] = MARK_SYMBOLS.index('V')
\ No newline at end of file